@@ -36,5 +36,8 @@ setup(
     ],
     keywords='valve keyvalue vdf tf2 dota2 csgo',
     packages=['vdf'],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     zip_safe=True,
 )
@@ -0,0 +1,136 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+import vdf
+
+
+def appinfo_file(apps, magic=0x07564428):
+    out = [struct.pack('<II', magic, 1)]
+    key_table = [] if magic >= 0x07564429 else None
+
+    if key_table is not None:
+        out.append(b'')
+
+    for appid, data in apps:
+        data = vdf.binary_dumps(data, key_table=key_table)
+        header = struct.pack('<IIQ20sI', 2, 1600000000, 0, b'\x01' * 20, 100 + appid)
+        if magic >= 0x07564428:
+            header += b'\x02' * 20
+        out.append(struct.pack('<II', appid, len(header) + len(data)) + header + data)
+
+    out.append(struct.pack('<I', 0))
+
+    if key_table is not None:
+        out[1] = struct.pack('<q', len(b''.join(out)) + 8)
+        out.append(struct.pack('<I', len(key_table)))
+        out.extend(key.encode('utf-8') + b'\x00' for key in key_table)
+
+    return b''.join(out)
+
+def packageinfo_file(packages, magic=0x06565528):
+    out = [struct.pack('<II', magic, 1)]
+
+    for packageid, data in packages:
+        out.append(struct.pack('<I20sI', packageid, b'\x01' * 20, 100 + packageid))
+        if magic >= 0x06565528:
+            out.append(struct.pack('<Q', 5))
+        out.append(vdf.binary_dumps(data))
+
+    out.append(struct.pack('<I', 0xFFFFFFFF))
+    return b''.join(out)
+
+
+class AppInfoCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.apps = [(appid, {'appinfo': {'appid': appid, 'common': {'name': 'app %d' % appid}}})
+                     for appid in (440, 10, 730)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_appinfo(self):
+        for magic in (0x07564427, 0x07564428, 0x07564429):
+            path = self.write('appinfo.vdf', appinfo_file(self.apps, magic))
+
+            with vdf.AppInfo(path) as appinfo:
+                self.assertEqual(list(appinfo), [440, 10, 730])
+                self.assertEqual(len(appinfo), 3)
+                self.assertIn(730, appinfo)
+                self.assertNotIn(20, appinfo)
+                self.assertEqual(appinfo[10], dict(self.apps)[10])
+                self.assertEqual(appinfo.get(20), None)
+                self.assertEqual(list(appinfo.items()), self.apps)
+
+                header = appinfo.header(730)
+                self.assertEqual(header['appid'], 730)
+                self.assertEqual(header['change_number'], 830)
+                self.assertEqual('binary_sha1' in header, magic >= 0x07564428)
+                self.assertEqual(appinfo.key_table is not None, magic == 0x07564429)
+
+                with self.assertRaises(KeyError):
+                    appinfo[20]
+
+    def test_packageinfo(self):
+        for magic in (0x06565527, 0x06565528):
+            path = self.write('packageinfo.vdf', packageinfo_file(self.apps, magic))
+
+            with vdf.AppInfo(path, mapper=vdf.VDFDict) as packageinfo:
+                self.assertEqual(list(packageinfo), [440, 10, 730])
+                self.assertEqual(packageinfo[730], vdf.binary_loads(vdf.binary_dumps(dict(self.apps)[730]), mapper=vdf.VDFDict))
+                self.assertEqual(packageinfo.header(10)['packageid'], 10)
+                self.assertEqual('access_token' in packageinfo.header(10), magic == 0x06565528)
+
+    def test_select(self):
+        path = self.write('appinfo.vdf', appinfo_file(self.apps, 0x07564429))
+
+        for stop_early in (False, True):
+            with vdf.AppInfo(path, select=['appinfo', 'common', 'name'], stop_early=stop_early) as appinfo:
+                self.assertEqual(appinfo[440], {'appinfo': {'common': {'name': 'app 440'}}})
+
+        with self.assertRaises(TypeError):
+            vdf.AppInfo(path, select='appinfo')
+
+    def test_index_path(self):
+        path = self.write('appinfo.vdf', appinfo_file(self.apps))
+        index_path = os.path.join(self.tmpdir, 'appinfo.index')
+
+        with vdf.AppInfo(path, index_path=index_path) as appinfo:
+            self.assertEqual(list(appinfo), [440, 10, 730])
+        self.assertTrue(os.path.exists(index_path))
+
+        # the saved index is used
+        with mock.patch.object(vdf.AppInfo, '_scan') as scan:
+            with vdf.AppInfo(path, index_path=index_path) as appinfo:
+                self.assertEqual(appinfo[730], dict(self.apps)[730])
+            self.assertFalse(scan.called)
+
+        # and replaced, when the file changes
+        self.write('appinfo.vdf', appinfo_file(self.apps[:2]))
+
+        with vdf.AppInfo(path, index_path=index_path) as appinfo:
+            self.assertEqual(list(appinfo), [440, 10])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            vdf.AppInfo(self.write('empty.vdf', b''))
+        with self.assertRaises(ValueError):
+            vdf.AppInfo(self.write('magic.vdf', b'\x00' * 16))
+        with self.assertRaises(SyntaxError):
+            vdf.AppInfo(self.write('truncated.vdf', appinfo_file(self.apps)[:-4]))
+        with self.assertRaises(TypeError):
+            vdf.AppInfo(self.write('appinfo.vdf', appinfo_file(self.apps)), mapper=list)
@@ -1,4 +1,8 @@
+import os
 import sys
+import mmap
+import json
+import tempfile
 import unittest
 
 import vdf
@@ -145,6 +149,45 @@ class BinaryVDF(unittest.TestCase):
 
         self.assertEqual(vdf.binary_loads(test, merge_duplicate_keys=False), result)
 
+    def test_merge_multiple_keys_vdfdict(self):
+        data = vdf.VDFDict([('a', vdf.VDFDict([('b', '2')])), ('a', '1'), ('c', vdf.VDFDict([('b', '3')])),
+                            ('c', vdf.VDFDict([('b', '4')])), ('c', 5)])
+        test = vdf.binary_dumps(data)
+
+        self.assertEqual(vdf.binary_loads(test, mapper=vdf.VDFDict, merge_duplicate_keys=False), data)
+        self.assertEqual(vdf.binary_loads(test, mapper=vdf.VDFDict), vdf.VDFDict([
+            ('a', vdf.VDFDict([('b', '2')])), ('a', '1'), ('c', vdf.VDFDict([('b', '3'), ('b', '4')])), ('c', 5),
+        ]))
+
+    def test_vdfdict_json(self):
+        data = vdf.VDFDict([('a', vdf.VDFDict([('b', '1'), ('b', '2')])), ('c', vdf.VDFDict()), ('d', 3),
+                            ('a', vdf.VDFDict([('b', '4')]))])
+        test = vdf.binary_dumps(data)
+
+        for merge_duplicate_keys in (True, False):
+            result = vdf.binary_loads(test, mapper=vdf.VDFDict, merge_duplicate_keys=merge_duplicate_keys)
+            # encoders that read the dict directly see the same as the items
+            self.assertEqual(json.dumps(result), json.dumps(vdf.VDFDict(list(result.items()))))
+
+        result = vdf.binary_loads(vdf.binary_dumps({'a': {'b': '1'}, 'c': {}}), mapper=vdf.VDFDict)
+        self.assertEqual(json.loads(json.dumps(result)), {'a': {'b': '1'}, 'c': {}})
+
+    @unittest.skipIf(bytes is str, "raw keys are str on Python 2")
+    def test_vdfdict_raw(self):
+        test = vdf.binary_dumps({'a': {'b': 1}})
+
+        for merge_duplicate_keys in (True, False):
+            with self.assertRaises(TypeError):
+                vdf.binary_loads(test, mapper=vdf.VDFDict, raw=True, merge_duplicate_keys=merge_duplicate_keys)
+
+    def test_merge_block_into_value(self):
+        # an empty block leaves the value with the same key, otherwise setting items in it raises
+        for mapper in (dict, vdf.VDFDict):
+            self.assertEqual(vdf.binary_loads(b'\x02a\x00\x01\x00\x00\x00\x00a\x00\x08\x08', mapper=mapper),
+                             mapper([('a', 1)]))
+            with self.assertRaises(TypeError):
+                vdf.binary_loads(b'\x01a\x00x\x00\x00a\x00\x01b\x00c\x00\x08\x08', mapper=mapper)
+
     def test_raise_on_remaining(self):
         # default binary_loads is to raise
         with self.assertRaises(SyntaxError):
@@ -181,8 +224,481 @@ class BinaryVDF(unittest.TestCase):
         with self.assertRaises(ValueError):
             vdf.vbkv_loads(b'VBKV\x01\x02\x03\x04\x00a\x00\x0b\x0b')
 
+    def test_vbkv_high_checksum(self):
+        # the crc32 of this one doesn't fit in a signed int
+        data = {'a': '30'}
+
+        self.assertEqual(vdf.vbkv_loads(vdf.vbkv_dumps(data)), data)
+
+    def test_vbkv_load_dump(self):
+        data = {'a': {'b': 'c', 'd': 1}}
+        buf = BytesIO()
+        vdf.vbkv_dump(data, buf)
+
+        self.assertEqual(buf.getvalue(), vdf.vbkv_dumps(data))
+
+        buf.seek(0)
+        self.assertEqual(vdf.vbkv_load(buf), data)
+        self.assertEqual(buf.tell(), len(buf.getvalue()))
+
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                vdf.vbkv_dump(data, f)
+            with open(path, 'rb') as f:
+                self.assertEqual(vdf.vbkv_load(f, mapper=OrderedDict), data)
+        finally:
+            os.remove(path)
+
+    def test_vbkv_verify_only(self):
+        test = vdf.vbkv_dumps({'a': {'b': 'c'}})
+
+        class Reader(object):
+            def __init__(self, data):
+                self.read = BytesIO(data).read
+
+        self.assertIsNone(vdf.vbkv_loads(test, verify_only=True))
+        self.assertIsNone(vdf.vbkv_load(Reader(test), verify_only=True))
+
+        corrupted = test[:-2] + b'\x00' + test[-1:]
+        with self.assertRaises(ValueError):
+            vdf.vbkv_loads(corrupted, verify_only=True)
+        with self.assertRaises(ValueError):
+            vdf.vbkv_load(Reader(corrupted), verify_only=True)
+        with self.assertRaises(ValueError):
+            vdf.vbkv_load(Reader(b'VBKV\x00'), verify_only=True)
+
     def test_loads_utf8_invalmid(self):
         self.assertEqual({'aaa': b'bb\xef\xbf\xbdbb'.decode('utf-8')}, vdf.binary_loads(b'\x01aaa\x00bb\xffbb\x00\x08'))
 
     def test_loads_utf16(self):
         self.assertEqual({'aaa': b'b\x00b\x00\xff\xffb\x00b\x00'.decode('utf-16le')}, vdf.binary_loads(b'\x05aaa\x00b\x00b\x00\xff\xffb\x00b\x00\x00\x00\x08'))
+
+    def test_loads_intern(self):
+        test = b'\x00a\x00\x01name\x00value\x00\x08\x00b\x00\x01name\x00value\x00\x08\x08'
+        result = vdf.binary_loads(test, intern=True)
+
+        self.assertEqual(result, vdf.binary_loads(test))
+        self.assertIs(list(result['a'])[0], list(result['b'])[0])
+        self.assertIs(result['a']['name'], result['b']['name'])
+
+    def test_loads_buffers(self):
+        test = b'\x00a\x00\x01b\x00c\x00\x02d\x00\x01\x00\x00\x00\x08\x08'
+        result = {'a': {'b': 'c', 'd': 1}}
+
+        self.assertEqual(vdf.binary_loads(bytearray(test)), result)
+        self.assertEqual(vdf.binary_loads(memoryview(test)), result)
+
+    def test_load_file(self):
+        test = b'\x00a\x00\x01b\x00c\x00\x08\x08'
+        fd, path = tempfile.mkstemp()
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b'head' + test + b'tail')
+
+            with open(path, 'rb') as f:
+                f.read(4)
+                self.assertEqual(vdf.binary_load(f), {'a': {'b': 'c'}})
+                self.assertEqual(f.read(), b'tail')
+
+                f.seek(4)
+                with self.assertRaises(SyntaxError):
+                    vdf.binary_load(f, raise_on_remaining=True)
+                self.assertEqual(f.read(), b'tail')
+
+            with open(path, 'wb') as f:
+                f.write(test)
+
+            with open(path, 'rb') as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.assertEqual(vdf.binary_loads(m), {'a': {'b': 'c'}})
+                m.close()
+        finally:
+            os.remove(path)
+
+    def test_loads_error_offsets(self):
+        with self.assertRaises(SyntaxError) as ctx:
+            vdf.binary_loads(b'\x01a\x00bb')
+        self.assertEqual(ctx.exception.args[0], "Unterminated cstring (offset: 3)")
+
+        with self.assertRaises(SyntaxError) as ctx:
+            vdf.binary_loads(b'\x01a\x00b\x00\x33')
+        self.assertEqual(ctx.exception.args[0], "Unknown data type at offset 5: %s" % repr(b'\x33'))
+
+    def test_key_table(self):
+        data = {'a': {'b': 'c', 'd': {'b': 1}}, 'e': vdf.UINT_64(5)}
+        key_table = ['e']
+        test = vdf.binary_dumps(data, key_table=key_table)
+
+        self.assertEqual(sorted(key_table), ['a', 'b', 'd', 'e'])
+        self.assertEqual(key_table[0], 'e')
+        self.assertEqual(vdf.binary_loads(test, key_table=key_table), data)
+        self.assertEqual(vdf.binary_load(BytesIO(test), key_table=key_table), data)
+
+        self.assertEqual(vdf.binary_dumps({'e': 'f'}, key_table=key_table), b'\x01\x00\x00\x00\x00f\x00\x08')
+
+        with self.assertRaises(SyntaxError):
+            vdf.binary_loads(b'\x01\x04\x00\x00\x00f\x00\x08', key_table=key_table)
+        with self.assertRaises(TypeError):
+            vdf.binary_dumps(data, key_table=('a',))
+
+    def test_loads_select(self):
+        data = OrderedDict([('apps', OrderedDict([
+            ('10', OrderedDict([('common', OrderedDict([('name', 'a'), ('type', 'Game'), ('icon', u'\u0444')])),
+                                ('depots', {'11': {'size': vdf.UINT_64(5)}})])),
+            ('20', OrderedDict([('common', OrderedDict([('name', 'b'), ('type', 'Tool')])),
+                                ('extended', {'name': 'x'})])),
+        ])), ('tail', 1)])
+        test = vdf.binary_dumps(data)
+
+        self.assertEqual(vdf.binary_loads(test, select=['apps', '*', 'common', 'name']),
+                         {'apps': {'10': {'common': {'name': 'a'}}, '20': {'common': {'name': 'b'}}}})
+        self.assertEqual(vdf.binary_loads(test, select=[['apps', '*', 'common', 'type'], ['tail']]),
+                         {'apps': {'10': {'common': {'type': 'Game'}}, '20': {'common': {'type': 'Tool'}}}, 'tail': 1})
+        self.assertEqual(vdf.binary_loads(test, select=['apps', '10', 'depots']),
+                         {'apps': {'10': {'depots': {'11': {'size': vdf.UINT_64(5)}}}}})
+        self.assertEqual(vdf.binary_loads(test, select=['apps', '10', 'common', 'icon']),
+                         {'apps': {'10': {'common': {'icon': u'\u0444'}}}})
+        self.assertEqual(vdf.binary_loads(test, select=['apps', '30']), {})
+
+        key_table = []
+        test = vdf.binary_dumps(data, key_table=key_table)
+        self.assertEqual(vdf.binary_loads(test, key_table=key_table, select=['apps', '20', 'common']),
+                         {'apps': {'20': {'common': {'name': 'b', 'type': 'Tool'}}}})
+
+    def test_load_select_stops_early(self):
+        data = OrderedDict([('a', OrderedDict([('b', 1), ('c', {'d': 2})])), ('e', 3)])
+        test = vdf.binary_dumps(data)
+
+        # the rest isn't looked at, unless the end is needed
+        result = vdf.binary_loads(test + b'\x33', select=['a', 'b'], raise_on_remaining=False, stop_early=True)
+        self.assertEqual(result, {'a': {'b': 1}})
+
+        with self.assertRaises(SyntaxError):
+            vdf.binary_loads(test + b'\x33', select=['a', 'b'], stop_early=True)
+        with self.assertRaises(SyntaxError):
+            vdf.binary_loads(test[:-3], select=['a', 'b'], stop_early=True)
+        with self.assertRaises(SyntaxError):
+            vdf.binary_loads(test[:-3], select=['a', 'b'], raise_on_remaining=False)
+
+        for stop_early in (False, True):
+            fp = BytesIO(test + b'tail')
+            self.assertEqual(vdf.binary_load(fp, select=['a', 'b'], stop_early=stop_early), {'a': {'b': 1}})
+            self.assertEqual(fp.read(), b'tail')
+
+    def test_select_duplicates(self):
+        test = vdf.binary_dumps(vdf.VDFDict([('a', '1'), ('b', {'x': '1'}), ('a', '2'), ('b', {'y': '2'})]))
+
+        self.assertEqual(vdf.binary_loads(test), {'a': '2', 'b': {'x': '1', 'y': '2'}})
+        self.assertEqual(vdf.binary_loads(test, select=['a']), {'a': '2'})
+        self.assertEqual(vdf.binary_loads(test, select=['b', 'y']), {'b': {'y': '2'}})
+        self.assertEqual(vdf.binary_load(BytesIO(test), select=['b']), {'b': {'x': '1', 'y': '2'}})
+
+        # a value replaces the block the path went through
+        test2 = vdf.binary_dumps(vdf.VDFDict([('b', {'y': '1'}), ('b', '2')]))
+        self.assertEqual(vdf.binary_loads(test2), {'b': '2'})
+        self.assertEqual(vdf.binary_loads(test2, select=['b', 'y']), {})
+        self.assertEqual(vdf.binary_loads(test2, select=['b', 'y'], raw=True), {})
+        self.assertEqual(vdf.binary_loads(test2, select=['b', 'y'], mapper=vdf.VDFDict),
+                         vdf.VDFDict([('b', vdf.VDFDict([('y', '1')]))]))
+
+        key_table = []
+        test2 = vdf.binary_dumps(vdf.VDFDict([('a', {'b': {'y': '1'}}), ('a', {'b': '2'})]), key_table=key_table)
+        self.assertEqual(vdf.binary_loads(test2, key_table=key_table, select=['a', 'b', 'y']), {'a': {}})
+
+        # and without merging, so does a block
+        test2 = vdf.binary_dumps(vdf.VDFDict([('b', {'y': '1'}), ('b', {'z': '2'})]))
+        self.assertEqual(vdf.binary_loads(test2, select=['b', 'y'], merge_duplicate_keys=False), {})
+
+        # only the first occurrence, when stopping early
+        self.assertEqual(vdf.binary_loads(test, select=['a'], stop_early=True), {'a': '1'})
+        self.assertEqual(vdf.binary_loads(test, select=['b'], stop_early=True), {'b': {'x': '1'}})
+
+    def test_select_invalid(self):
+        for select in ([], 'a', [['a'], 5], [[]]):
+            with self.assertRaises((TypeError, ValueError)):
+                vdf.binary_loads(b'', select=select)
+            with self.assertRaises((TypeError, ValueError)):
+                vdf.binary_load(BytesIO(b''), select=select)
+
+    def test_loads_raw(self):
+        data = OrderedDict([('a', OrderedDict([(u'\u0430', u'\u0431'), ('b', 1)])), ('c', 'd')])
+        test = vdf.binary_dumps(data)
+        result = vdf.binary_loads(test, raw=True)
+
+        self.assertEqual(result, {b'a': {u'\u0430'.encode('utf-8'): u'\u0431'.encode('utf-8'), b'b': 1}, b'c': b'd'})
+        self.assertEqual(vdf.binary_dumps(vdf.binary_loads(test, raw=True, mapper=OrderedDict)), test)
+        self.assertEqual(vdf.binary_load(BytesIO(test), raw=True), result)
+        self.assertEqual(vdf.binary_loads(test, raw=True, select=['a', u'\u0430']),
+                         {b'a': {u'\u0430'.encode('utf-8'): u'\u0431'.encode('utf-8')}})
+
+        # wide strings are still decoded
+        self.assertEqual(vdf.binary_loads(b'\x05a\x00b\x00\x00\x00\x08', raw=True), {b'a': u'b'})
+
+        test = b'\x00a\x00\x01name\x00value\x00\x08\x00b\x00\x01name\x00value\x00\x08\x08'
+        result = vdf.binary_loads(test, raw=True, intern=True)
+        self.assertIs(list(result[b'a'])[0], list(result[b'b'])[0])
+        self.assertIs(result[b'a'][b'name'], result[b'b'][b'name'])
+
+    def test_dumps_bytes(self):
+        self.assertEqual(vdf.binary_dumps({b'a': b'\xff'}), b'\x01a\x00\xff\x00\x08')
+
+    def test_dump_single_write(self):
+        data = OrderedDict([('a', OrderedDict([('b', 'c'), ('d', vdf.UINT_64(1))])), ('e', 1.0)])
+        writes = []
+
+        class Writer(object):
+            def write(self, data):
+                writes.append(bytes(data))
+
+        vdf.binary_dump(data, Writer())
+        self.assertEqual(writes, [vdf.binary_dumps(data)])
+
+        # nothing is written when a value can't be encoded
+        del writes[:]
+        with self.assertRaises(TypeError):
+            vdf.binary_dump(OrderedDict([('a', 'b'), ('c', None)]), Writer())
+        self.assertEqual(writes, [])
+
+    def test_dumps_repeated_keys(self):
+        data = OrderedDict([('a', OrderedDict([('a', 'b')])), ('b', 1)])
+
+        self.assertEqual(vdf.binary_dumps(data), b'\x00a\x00\x01a\x00b\x00\x08\x02b\x00\x01\x00\x00\x00\x08')
+        with self.assertRaises(TypeError):
+            vdf.binary_dumps({'a': {1: 'b'}})
+
+
+class BinaryLoadIter(unittest.TestCase):
+    DOCS = [{'a': {'b': 'c'}}, {'e': {}}, {'d': 1}]
+
+    def setUp(self):
+        self.test = b''.join(vdf.binary_dumps(doc) for doc in self.DOCS)
+        self.offsets = [0, 10, 15]
+
+    def test_buffers(self):
+        expected = list(zip(self.offsets, self.DOCS))
+
+        for test in (self.test, bytearray(self.test), memoryview(self.test)):
+            self.assertEqual(list(vdf.binary_load_iter(test)), expected)
+
+        self.assertEqual(list(vdf.binary_load_iter(b'')), [])
+
+    def test_streams(self):
+        expected = [(offset + 4, doc) for offset, doc in zip(self.offsets, self.DOCS)]
+        fd, path = tempfile.mkstemp()
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b'head' + self.test)
+
+            with open(path, 'rb') as f:
+                f.seek(4)
+                self.assertEqual(list(vdf.binary_load_iter(f)), expected)
+                self.assertEqual(f.tell(), len(self.test) + 4)
+        finally:
+            os.remove(path)
+
+        fp = BytesIO(b'head' + self.test)
+        fp.seek(4)
+        self.assertEqual(list(vdf.binary_load_iter(fp)), expected)
+
+    def test_stop(self):
+        fp = BytesIO(self.test + b'\x33')
+        docs = vdf.binary_load_iter(fp, mapper=OrderedDict)
+
+        self.assertEqual(next(docs), (0, {'a': {'b': 'c'}}))
+        docs.close()
+        self.assertEqual(fp.tell(), 10)
+
+        fp.seek(0)
+        with self.assertRaises(SyntaxError):
+            list(vdf.binary_load_iter(fp))
+        self.assertEqual(fp.tell(), len(self.test))
+
+    def test_alt_format(self):
+        test = b''.join(vdf.binary_dumps(doc, alt_format=True) for doc in self.DOCS)
+        self.assertEqual([doc for _, doc in vdf.binary_load_iter(test, alt_format=True)], self.DOCS)
+
+    def test_invalid(self):
+        for fp in (u'', 5, None):
+            with self.assertRaises(TypeError):
+                list(vdf.binary_load_iter(fp))
+        with self.assertRaises(TypeError):
+            list(vdf.binary_load_iter(b'', mapper=list))
+
+
+class BinaryIterparse(unittest.TestCase):
+    INPUT = (b'\x00a\x00\x01b\x00c\x00\x05w\x00d\x00\x00\x00\x00e\x00\x07f\x00\x01\x00\x00\x00\x00\x00\x00\x00'
+             b'\x08\x08\x02g\x00\x01\x00\x00\x00\x0ah\x00\xff\xff\xff\xff\xff\xff\xff\xff'
+             b'\x04i\x00\x02\x00\x00\x00\x06j\x00\x03\x00\x00\x00\x03k\x00\x00\x00\x00\x3f\x08')
+
+    EXPECTED = [
+        ('start_map', 'a', None, vdf.BIN_NONE, 0),
+        ('value', 'b', 'c', vdf.BIN_STRING, 3),
+        ('value', 'w', 'd', vdf.BIN_WIDESTRING, 8),
+        ('start_map', 'e', None, vdf.BIN_NONE, 15),
+        ('value', 'f', vdf.UINT_64(1), vdf.BIN_UINT64, 18),
+        ('end_map', None, None, vdf.BIN_END, 29),
+        ('end_map', None, None, vdf.BIN_END, 30),
+        ('value', 'g', 1, vdf.BIN_INT32, 31),
+        ('value', 'h', vdf.INT_64(-1), vdf.BIN_INT64, 38),
+        ('value', 'i', vdf.POINTER(2), vdf.BIN_POINTER, 49),
+        ('value', 'j', vdf.COLOR(3), vdf.BIN_COLOR, 56),
+        ('value', 'k', 0.5, vdf.BIN_FLOAT32, 63),
+    ]
+
+    def test_source_asserts(self):
+        for t in [u'', 5, None, {}]:
+            with self.assertRaises(TypeError):
+                list(vdf.binary_iterparse(t))
+
+    def test_events(self):
+        events = list(vdf.binary_iterparse(self.INPUT))
+
+        self.assertEqual(events, self.EXPECTED)
+        self.assertEqual([type(event[2]) for event in events[3:]], [type(event[2]) for event in self.EXPECTED[3:]])
+
+        self.assertEqual(list(vdf.binary_iterparse(bytearray(self.INPUT))), self.EXPECTED)
+        self.assertEqual(list(vdf.binary_iterparse(memoryview(self.INPUT))), self.EXPECTED)
+
+    def test_alt_format(self):
+        events = list(vdf.binary_iterparse(b'\x00a\x00\x01b\x00c\x00\x0b\x0b', alt_format=True))
+
+        self.assertEqual(events, [('start_map', 'a', None, vdf.BIN_NONE, 0),
+                                  ('value', 'b', 'c', vdf.BIN_STRING, 3),
+                                  ('end_map', None, None, vdf.BIN_END_ALT, 8)])
+
+    def test_streams(self):
+        class Reader(object):
+            # returns a few bytes at a time, and can't be mapped
+            def __init__(self, data):
+                self.fp = BytesIO(data)
+
+            def read(self, size=-1):
+                return self.fp.read(min(size, 3))
+
+            def tell(self):
+                return self.fp.tell()
+
+            def seek(self, offset):
+                self.fp.seek(offset)
+
+        test = b'head' + self.INPUT + b'tail'
+        expected = [event[:4] + (event[4] + 4,) for event in self.EXPECTED]
+        fd, path = tempfile.mkstemp()
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(test)
+
+            with open(path, 'rb') as f:
+                f.seek(4)
+                self.assertEqual(list(vdf.binary_iterparse(f)), expected)
+                self.assertEqual(f.read(), b'tail')
+        finally:
+            os.remove(path)
+
+        for fp in (BytesIO(test), Reader(test)):
+            fp.seek(4)
+            self.assertEqual(list(vdf.binary_iterparse(fp)), expected)
+            self.assertEqual(fp.read(-1), b'tail')
+
+    def test_lazy(self):
+        class Reader(object):
+            def __init__(self):
+                self.calls = 0
+
+            def read(self, size):
+                self.calls += 1
+                return b'\x01a\x00b\x00' * (size // 5 + 1)
+
+        fp = Reader()
+        events = vdf.binary_iterparse(fp)
+
+        for i in range(100000):
+            self.assertEqual(next(events), ('value', 'a', 'b', vdf.BIN_STRING, i * 5))
+        self.assertLess(fp.calls, 10)
+
+    def test_key_table(self):
+        test = vdf.binary_dumps({'a': {'b': 1}}, key_table=['b', 'a'])
+        events = list(vdf.binary_iterparse(test, key_table=['b', 'a']))
+
+        self.assertEqual([event[:3] for event in events], [('start_map', 'a', None), ('value', 'b', 1),
+                                                           ('end_map', None, None)])
+
+    def test_exceptions(self):
+        for test in (b'\x00a\x00\x01b\x00c\x00', b'\x01a\x00b', b'\x02a\x00\x01\x00', b'\x05a\x00b\x00', b'\x33a\x00'):
+            with self.assertRaises(SyntaxError):
+                list(vdf.binary_iterparse(test))
+            with self.assertRaises(SyntaxError):
+                list(vdf.binary_iterparse(BytesIO(test)))
+
+        with self.assertRaises(SyntaxError) as ctx:
+            list(vdf.binary_iterparse(b'\x01a\x00b\x00\x33'))
+        self.assertEqual(ctx.exception.args[0], "Unknown data type at offset 5: %s" % repr(b'\x33'))
+
+
+class LazyBinaryVDFCase(unittest.TestCase):
+    def setUp(self):
+        self.data = OrderedDict([
+            ('a', 'test'),
+            ('b', 1),
+            ('c', 1.0),
+            ('d', vdf.UINT_64(1234)),
+            ('e', vdf.COLOR(1234)),
+            ('level1', OrderedDict([
+                ('f', b'\xd0\xb0\xd0\xb1'.decode('utf-8')),
+                ('level2', OrderedDict([('g', vdf.INT_64(-1234))])),
+            ])),
+        ])
+        self.buf = vdf.binary_dumps(self.data)
+
+    def test_access(self):
+        lazy = vdf.LazyBinaryVDF(self.buf)
+
+        self.assertEqual(lazy, self.data)
+        self.assertEqual(lazy['level1']['level2']['g'], vdf.INT_64(-1234))
+        self.assertIsInstance(lazy['level1'], vdf.LazyBinaryVDF)
+        self.assertIs(lazy['level1'], lazy['level1'])
+        self.assertIn('level1', lazy)
+        self.assertEqual(len(lazy['level1']), 2)
+        self.assertEqual(lazy.get('missing'), None)
+        with self.assertRaises(KeyError):
+            lazy['level1']['missing']
+
+    def test_buffers(self):
+        self.assertEqual(vdf.LazyBinaryVDF(bytearray(self.buf)), self.data)
+        self.assertEqual(vdf.LazyBinaryVDF(memoryview(self.buf)), self.data)
+        self.assertEqual(vdf.LazyBinaryVDF(vdf.binary_dumps(self.data, alt_format=True), alt_format=True), self.data)
+
+        with self.assertRaises(TypeError):
+            vdf.LazyBinaryVDF(u('a'))
+
+    def test_merge_duplicate_keys(self):
+        test = b'\x00a\x00\x01a\x001\x00\x01b\x002\x00\x08\x00a\x00\x01a\x003\x00\x01c\x004\x00\x08\x08'
+
+        self.assertEqual(vdf.LazyBinaryVDF(test), vdf.binary_loads(test))
+
+    def test_dumps(self):
+        # nested blocks are copied as they are
+        buf = vdf.binary_dumps({'root': self.data})
+        lazy = vdf.LazyBinaryVDF(buf)
+        lazy['root']['level1']['f']
+
+        self.assertEqual(vdf.binary_dumps(lazy), buf)
+
+        lazy = vdf.LazyBinaryVDF(self.buf)
+        self.assertEqual(vdf.binary_loads(vdf.binary_dumps(lazy, alt_format=True), alt_format=True), self.data)
+        self.assertEqual(vdf.loads(vdf.dumps(lazy)), vdf.loads(vdf.dumps(self.data)))
+
+    def test_errors(self):
+        lazy = vdf.LazyBinaryVDF(b'\x01a\x00b\x00\x00c\x00\x01d\x00e')
+
+        with self.assertRaises(SyntaxError):
+            len(lazy)
+
+        lazy = vdf.LazyBinaryVDF(b'\x01a\x00b\x00\x00c\x00\x33\x08\x08')
+
+        with self.assertRaises(SyntaxError):
+            lazy['a']
@@ -0,0 +1,123 @@
+import unittest
+from array import array
+from io import BytesIO
+from collections import OrderedDict
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import vdf
+
+
+class ExtractColumnsCase(unittest.TestCase):
+    INPUT = (
+        '"items_game"\n'
+        '{\n'
+        '    "items"\n'
+        '    {\n'
+        '        "1"\n'
+        '        {\n'
+        '            "name" "a"\n'
+        '            "price" "1.5"\n'
+        '            "used_by"\n'
+        '            {\n'
+        '                "scout" "1"\n'
+        '            }\n'
+        '        }\n'
+        '        "2"\n'
+        '        {\n'
+        '            "name" "b"\n'
+        '            "used_by" "all"\n'
+        '        }\n'
+        '        "3"\n'
+        '        {\n'
+        '            "other" "c"\n'
+        '        }\n'
+        '        "4" "not a record"\n'
+        '    }\n'
+        '}\n'
+    )
+
+    RECORDS = ['items_game', 'items', '*']
+    FIELDS = [('id', [], int), ('name', 'name', str), ('price', ['price'], float),
+              ('scout', ['used_by', 'scout'], 'i4')]
+
+    def test_tree(self):
+        tree = vdf.loads(self.INPUT, mapper=OrderedDict)
+        result = vdf.extract_columns(tree, self.RECORDS, self.FIELDS, use_numpy=False)
+
+        self.assertIsInstance(result, OrderedDict)
+        self.assertEqual(list(result), ['id', 'name', 'price', 'scout'])
+        self.assertEqual(list(result['id']), [1, 2])
+        self.assertEqual(result['name'], ['a', 'b'])
+        self.assertEqual(repr(result['price']), repr(array('d', [1.5, float('nan')])))
+        self.assertEqual(result['scout'], array('i', [1, 0]))
+
+    def test_file(self):
+        tree = vdf.extract_columns(vdf.loads(self.INPUT, mapper=OrderedDict), self.RECORDS, self.FIELDS,
+                                   use_numpy=False)
+        result = vdf.extract_columns(StringIO(self.INPUT), self.RECORDS, self.FIELDS, use_numpy=False,
+                                     mapper=OrderedDict)
+        self.assertEqual(repr(result), repr(tree))
+
+        test = vdf.binary_dumps(vdf.loads(self.INPUT, mapper=OrderedDict))
+        result = vdf.extract_columns(test, self.RECORDS, self.FIELDS[:2], binary=True, use_numpy=False,
+                                     mapper=OrderedDict)
+        self.assertEqual(result['name'], ['a', 'b'])
+
+        result = vdf.extract_columns(BytesIO(test), self.RECORDS, self.FIELDS[:2], binary=True, use_numpy=False,
+                                     mapper=OrderedDict)
+        self.assertEqual(result['name'], ['a', 'b'])
+
+    def test_keys_only(self):
+        for source in (vdf.loads(self.INPUT), StringIO(self.INPUT)):
+            result = vdf.extract_columns(source, self.RECORDS, [('id', [], 'u2')], use_numpy=False)
+            self.assertEqual(sorted(result['id']), [1, 2, 3])
+
+    def test_duplicates(self):
+        tree = vdf.loads('a\n{\nx\n{\nn 1\n}\nx\n{\nn 2\n}\ny\n{\nn 3\n}\n}\n', mapper=vdf.VDFDict,
+                         merge_duplicate_keys=False)
+        result = vdf.extract_columns(tree, ['a', 'x'], [('n', 'n', int)], use_numpy=False)
+
+        self.assertEqual(list(result['n']), [1, 2])
+
+    def test_invalid(self):
+        tree = vdf.loads(self.INPUT)
+
+        for records, fields in ((['a', 5], self.FIELDS),
+                                ([['a'], ['b']], self.FIELDS),
+                                (self.RECORDS, []),
+                                (self.RECORDS, 'name'),
+                                (self.RECORDS, [('name', 'name')]),
+                                (self.RECORDS, [('name', 5, str)])):
+            with self.assertRaises(TypeError):
+                vdf.extract_columns(tree, records, fields, use_numpy=False)
+
+        with self.assertRaises(ValueError):
+            vdf.extract_columns(tree, self.RECORDS, [('name', 'name', 'U8')], use_numpy=False)
+        with self.assertRaises(ValueError):
+            vdf.extract_columns(tree, self.RECORDS, [('name', 'name', int)], use_numpy=False)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        result = vdf.extract_columns(StringIO(self.INPUT), self.RECORDS, self.FIELDS + [('name2', 'name', 'U4')],
+                                     mapper=OrderedDict)
+
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.dtype.names, ('id', 'name', 'price', 'scout', 'name2'))
+        self.assertEqual(list(result['id']), [1, 2])
+        self.assertEqual(list(result['name2']), ['a', 'b'])
+        self.assertEqual(list(result['scout']), [1, 0])
+        self.assertTrue(numpy.isnan(result['price'][1]))
+
+    @unittest.skipIf(numpy is not None, "NumPy is installed")
+    def test_numpy_missing(self):
+        with self.assertRaises(ValueError):
+            vdf.extract_columns(vdf.loads(self.INPUT), self.RECORDS, self.FIELDS, use_numpy=True)
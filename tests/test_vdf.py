@@ -1,5 +1,10 @@
 import unittest
 import sys
+import json
+import os
+import codecs
+import shutil
+import tempfile
 
 try:
     from unittest import mock
@@ -12,6 +17,7 @@ except ImportError:
         from io import StringIO
 
 import vdf
+from collections import OrderedDict
 
 
 class testcase_helpers_escapes(unittest.TestCase):
@@ -123,6 +129,16 @@ class testcase_helpers_dump(unittest.TestCase):
         self.assertEqual(expected, self.f.read())
 
 
+    def test_dumps_vdfdict(self):
+        d = vdf.VDFDict([('x', '0'), ('a', vdf.VDFDict([('b', '1'), ('b', '2')])), ('a', '3')])
+        self.assertEqual(vdf.dumps(d), '"x" "0"\n"a"\n{\n"b" "1"\n"b" "2"\n}\n"a" "3"\n')
+
+        # with deleted items
+        del d['x']
+        del d['a']['b']
+        self.assertEqual(vdf.dumps(d), '"a"\n{\n"b" "2"\n}\n"a" "3"\n')
+        self.assertEqual(vdf.binary_dumps(d), b'\x00a\x00\x01b\x002\x00\x08\x01a\x003\x00\x08')
+
 class testcase_routine_parse(unittest.TestCase):
     def test_parse_bom_removal(self):
         result = vdf.loads(vdf.BOMS + '"asd" "123"')
@@ -382,6 +398,45 @@ class testcase_VDF(unittest.TestCase):
         self.assertEqual(vdf.loads(INPUT, merge_duplicate_keys=False), EXPECTED)
         self.assertEqual(vdf.loads(INPUT, escaped=False, merge_duplicate_keys=False), EXPECTED)
 
+    def test_merge_multiple_keys_vdfdict(self):
+        INPUT = 'a 1\na\n{\nb 2\n}\nc\n{\nb 3\n}\nc\n{\nb 4\n}\nc 5\n'
+
+        class CustomDict(vdf.VDFDict):
+            # items are set one by one, instead of in bulk
+            def __setitem__(self, key, value):
+                super(CustomDict, self).__setitem__(key, value)
+
+        for mapper in (vdf.VDFDict, CustomDict):
+            self.assertEqual(vdf.loads(INPUT, mapper=mapper), vdf.VDFDict([
+                ('a', '1'), ('a', vdf.VDFDict([('b', '2')])), ('c', vdf.VDFDict([('b', '3'), ('b', '4')])), ('c', '5'),
+            ]))
+            self.assertEqual(vdf.loads(INPUT, mapper=mapper, merge_duplicate_keys=False), vdf.VDFDict([
+                ('a', '1'), ('a', vdf.VDFDict([('b', '2')])), ('c', vdf.VDFDict([('b', '3')])),
+                ('c', vdf.VDFDict([('b', '4')])), ('c', '5'),
+            ]))
+
+    def test_vdfdict_json(self):
+        INPUT = 'a\n{\nb 1\nb 2\n}\nc\n{\n}\nd 3\na\n{\nb 4\n}\n'
+
+        for merge_duplicate_keys in (True, False):
+            result = vdf.loads(INPUT, mapper=vdf.VDFDict, merge_duplicate_keys=merge_duplicate_keys)
+            # encoders that read the dict directly see the same as the items
+            self.assertEqual(json.dumps(result), json.dumps(vdf.VDFDict(list(result.items()))))
+
+        result = vdf.loads('a\n{\nb 1\n}\nc\n{\n}\nd 3\n', mapper=vdf.VDFDict, merge_duplicate_keys=False)
+        self.assertEqual(json.loads(json.dumps(result)), {'a': {'b': '1'}, 'c': {}, 'd': '3'})
+
+        parser = vdf.IncrementalParser(mapper=vdf.VDFDict)
+        parser.feed('a\n{\nb 1\n')
+        self.assertEqual(json.loads(json.dumps(parser.root)), {'a': {'b': '1'}})
+
+    @unittest.skipIf(bytes is str, "raw keys are str on Python 2")
+    def test_vdfdict_raw(self):
+        with self.assertRaises(TypeError):
+            vdf.loads(b'a 1\n', mapper=vdf.VDFDict, raw=True)
+        with self.assertRaises(TypeError):
+            vdf.loads(b'a\n{\nb 1\n}\n', mapper=vdf.VDFDict, raw=True, merge_duplicate_keys=False)
+
     def test_escape_before_last(self):
         INPUT = r'''
         "aaa\\" "1"
@@ -504,6 +559,558 @@ class testcase_VDF(unittest.TestCase):
 
         self.assertEqual(vdf.loads(INPUT), EXPECTED)
 
+class testcase_parse_engines(unittest.TestCase):
+    INPUTS = [
+        '',
+        '"key1" "value1"\nkey2 "value2"\nKEY3 value3 with spaces  \n',
+        '"key1" "a\nb\nc"\nkey2 "a\\"\nb"\n"k\ney" v\n',
+        'root1\n{\n"key1" {}\nkey2 "value2"\n}\nroot2 { }\nroot3 {\nkey1 "value1" // c\n}\n',
+        '// comment\n"key1" "value1" // comment\n"key2" // comment\n{ // comment\nk v\n}\n',
+        'a\n{\na 1\nb 2\n}\na\n{\na 3\nc 4\n}\na b\n',
+        '#include "asd.vdf"\n#base asd.vdf\nc zxc_-*.sss//\nd<2?$% /cde/$fgh/<i>\n',
+        '"aaa\\\\" "1"\n"1" "bbb\\\\"\n"\\"q\\"" "\\t"\n',
+        vdf.BOMS + '"asd" "123"\r\n"zxc" {\r\n"a" "b"\r\n}\r\n',
+        '"key" "value" "ignored" {\n"key2" value2 }\n',
+    ]
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            vdf.loads('', engine='asd')
+
+    def test_engines_equivalent(self):
+        for text in self.INPUTS:
+            for kwargs in ({}, {'escaped': False}, {'merge_duplicate_keys': False}, {'mapper': vdf.VDFDict}):
+                self.assertEqual(vdf.loads(text, engine='regex', **kwargs),
+                                 vdf.loads(text, engine='scanner', **kwargs))
+
+    def test_chunked_input(self):
+        class ChunkedIO(StringIO):
+            def read(self, size=-1):
+                return StringIO.read(self, 3)
+
+        for text in self.INPUTS:
+            self.assertEqual(vdf.parse(ChunkedIO(text)), vdf.loads(text, engine='regex'))
+
+    def test_long_multiline_value(self):
+        value = 'line\n' * 50000
+        self.assertEqual(vdf.loads('"key" "%s"\n"key2" "2"' % value), {'key': value, 'key2': '2'})
+
+    def test_syntax_error_lineno(self):
+        tests = [
+            ('"asd" "123"\n"zxc" "a\nb"\n}\n', 4),
+            ('"asd"\n\n// comment\n"zxc" "333"\n', 4),
+            ('a\n{\nb\n{\n}\n', 5),
+        ]
+
+        for text, lineno in tests:
+            with self.assertRaises(SyntaxError) as ctx:
+                vdf.loads(text)
+            self.assertEqual(ctx.exception.lineno, lineno)
+
+        # after a multi-line value, regex doesn't count the lines the value continued on
+        text = '"a" "x\ny\nz"\n"b"\n{\n}\n}\n'
+        for engine, lineno in (('scanner', 7), ('regex', 5)):
+            with self.assertRaises(SyntaxError) as ctx:
+                vdf.loads(text, engine=engine)
+            self.assertEqual(ctx.exception.lineno, lineno)
+            self.assertEqual(ctx.exception.text, '}\n')
+
+        for test in testcase_VDF_other.INVALID:
+            self.assertRaises(SyntaxError, vdf.loads, test, engine='regex')
+
+
+class testcase_iterparse(unittest.TestCase):
+    def test_source_asserts(self):
+        for t in ['', 5, None, {}]:
+            with self.assertRaises(TypeError):
+                list(vdf.iterparse(t))
+
+    def test_events(self):
+        INPUT = (
+            '"root"\n'
+            '{\n'
+            '    "key1" "value\\tone"\n'
+            '    // comment\n'
+            '    key2 {}\n'
+            '    "key3" "a\n'
+            'b"\n'
+            '}\n'
+            'root2 value2\n'
+        )
+
+        EXPECTED = [
+            ('start_map', 'root', None, 1),
+            ('value', 'key1', 'value\tone', 3),
+            ('start_map', 'key2', None, 5),
+            ('end_map', None, None, 5),
+            ('value', 'key3', 'a\nb', 6),
+            ('end_map', None, None, 8),
+            ('value', 'root2', 'value2', 9),
+        ]
+
+        self.assertEqual(list(vdf.iterparse(StringIO(INPUT))), EXPECTED)
+
+        events = list(vdf.iterparse(StringIO(INPUT), escaped=False))
+        self.assertEqual(events[1], ('value', 'key1', 'value\\tone', 3))
+
+    def test_duplicates_reported(self):
+        events = list(vdf.iterparse(StringIO('a 1\na 2\n')))
+        self.assertEqual(events, [('value', 'a', '1', 1), ('value', 'a', '2', 2)])
+
+    def test_lazy(self):
+        events = vdf.iterparse(StringIO('a 1\n' + 'b 2\n' * 100000 + '}\n'))
+        self.assertEqual(next(events), ('value', 'a', '1', 1))
+
+    def test_exceptions(self):
+        for test in testcase_VDF_other.INVALID:
+            with self.assertRaises(SyntaxError):
+                list(vdf.iterparse(StringIO(test)))
+
+
+class testcase_parse_select(unittest.TestCase):
+    INPUT = (
+        '"items_game"\n'
+        '{\n'
+        '    "game_info"\n'
+        '    {\n'
+        '        "a" "b"\n'
+        '    }\n'
+        '    "items"\n'
+        '    {\n'
+        '        "1"\n'
+        '        {\n'
+        '            "name" "one"\n'
+        '            "prefab" "x"\n'
+        '        }\n'
+        '        "2"\n'
+        '        {\n'
+        '            "name" "two\\tlines"\n'
+        '            "attributes"\n'
+        '            {\n'
+        '                "name" "nested"\n'
+        '            }\n'
+        '        }\n'
+        '        "3" { }\n'
+        '    }\n'
+        '}\n'
+        '"other"\n'
+        '{\n'
+        '    "items" {\n'
+        '        "1" "zzz"\n'
+        '    }\n'
+        '}\n'
+    )
+
+    def test_select_wildcard(self):
+        self.assertEqual(vdf.loads(self.INPUT, select=['items_game', 'items', '*', 'name']),
+                         {'items_game': {'items': {'1': {'name': 'one'}, '2': {'name': 'two\tlines'}}}})
+
+    def test_select_subtree(self):
+        self.assertEqual(vdf.loads(self.INPUT, select=['items_game', 'items', '2']),
+                         {'items_game': {'items': {'2': {'name': 'two\tlines',
+                                                         'attributes': {'name': 'nested'}}}}})
+
+    def test_select_multiple(self):
+        self.assertEqual(vdf.loads(self.INPUT, select=[['items_game', 'game_info'], ['*', 'items', '1']]),
+                         {'items_game': {'game_info': {'a': 'b'}, 'items': {'1': {'name': 'one', 'prefab': 'x'}}},
+                          'other': {'items': {'1': 'zzz'}}})
+
+    def test_select_no_match(self):
+        self.assertEqual(vdf.loads(self.INPUT, select=['items_game', 'nothing']), {})
+
+        for test in testcase_VDF_other.INVALID:
+            self.assertRaises(SyntaxError, vdf.loads, test, select=['nothing'])
+
+    def test_select_duplicates(self):
+        text = '"a" "1"\n"b"\n{\n"x" "1"\n}\n"a" "2"\n"b"\n{\n"y" "2"\n}\n'
+
+        self.assertEqual(vdf.loads(text), {'a': '2', 'b': {'x': '1', 'y': '2'}})
+        self.assertEqual(vdf.loads(text, select=['a']), {'a': '2'})
+        self.assertEqual(vdf.loads(text, select=['b', 'y']), {'b': {'y': '2'}})
+        self.assertEqual(vdf.loads(text, select=['b']), {'b': {'x': '1', 'y': '2'}})
+
+        # a value replaces the block the path went through
+        text = '"b"\n{\n"y" "1"\n}\n"b" "2"\n'
+        for data in (text, text.encode('utf-8')):
+            self.assertEqual(vdf.loads(data, select=['b', 'y']), {})
+            self.assertEqual(vdf.loads(data, select=['b', 'y'], mapper=OrderedDict), OrderedDict())
+            self.assertEqual(vdf.loads(data, select=['b', 'y'], mapper=vdf.VDFDict),
+                             vdf.VDFDict([('b', vdf.VDFDict([('y', '1')]))]))
+        self.assertEqual(vdf.loads(text + '"b"\n{\n"y" "3"\n}\n', select=['b', 'y']), {'b': {'y': '3'}})
+        # also when the value is in a later block, that is merged into the first one, whose parent stays
+        text = '"a"\n{\n"b"\n{\n"y" "1"\n}\n}\n"a"\n{\n"b" "2"\n}\n'
+        self.assertEqual(vdf.loads(text, select=['a', 'b', 'y']), {'a': {}})
+
+        # and without merging, so does a block
+        text = '"b"\n{\n"y" "1"\n}\n"b"\n{\n"z" "2"\n}\n'
+        self.assertEqual(vdf.loads(text, merge_duplicate_keys=False), {'b': {'z': '2'}})
+        self.assertEqual(vdf.loads(text, select=['b', 'y'], merge_duplicate_keys=False), {})
+
+        text = '"a" "1"\n"b"\n{\n"x" "1"\n}\n"a" "2"\n"b"\n{\n"y" "2"\n}\n'
+
+        # only the first occurrence, when stopping early
+        self.assertEqual(vdf.loads(text, select=['a'], stop_early=True), {'a': '1'})
+        self.assertEqual(vdf.loads(text, select=['b'], stop_early=True), {'b': {'x': '1'}})
+
+    def test_select_stops_early(self):
+        text = self.INPUT + '"more"\n{\n' + '"key" "value"\n' * 100000 + '}\n'
+        fp = StringIO(text)
+
+        self.assertEqual(vdf.parse(fp, select=['items_game', 'game_info'], stop_early=True),
+                         {'items_game': {'game_info': {'a': 'b'}}})
+        self.assertLess(fp.tell(), len(text))
+
+        fp = StringIO(text)
+        self.assertEqual(vdf.parse(fp, select=['items_game', 'game_info']), {'items_game': {'game_info': {'a': 'b'}}})
+        self.assertEqual(fp.tell(), len(text))
+
+    def test_select_invalid(self):
+        for select in ['a', [], [1], [['a'], 'b'], [[]]]:
+            self.assertRaises((TypeError, ValueError), vdf.loads, self.INPUT, select=select)
+
+        self.assertRaises(ValueError, vdf.loads, self.INPUT, select=['a'], engine='regex')
+
+
+class testcase_incremental_parser(unittest.TestCase):
+    def test_mapper_assert(self):
+        self.assertRaises(TypeError, vdf.IncrementalParser, mapper=list)
+
+    def test_feed_chunks(self):
+        for text in testcase_parse_engines.INPUTS:
+            for size in (1, 2, 7, 64):
+                parser = vdf.IncrementalParser()
+                for i in range(0, len(text), size):
+                    parser.feed(text[i:i + size])
+                self.assertEqual(parser.close(), vdf.loads(text))
+
+    def test_feed_bytes(self):
+        text = u'"key" "\u0430\u0431\u0432"\n"\u0433" {\n"a" "b"\n}\n'
+        data = text.encode('utf-8')
+
+        # on Python 2, str chunks are text, as for parse()
+        for chunk_type in ((bytes, bytearray) if bytes is not str else (bytearray,)):
+            parser = vdf.IncrementalParser(mapper=vdf.VDFDict)
+            for i in range(len(data)):
+                parser.feed(chunk_type(data[i:i + 1]))
+
+            self.assertEqual(parser.close(), vdf.loads(text, mapper=vdf.VDFDict))
+
+    def test_feed_invalid(self):
+        parser = vdf.IncrementalParser()
+        self.assertRaises(TypeError, parser.feed, 5)
+        parser.close()
+        self.assertRaises(ValueError, parser.feed, '')
+
+    def test_feed_syntax_error(self):
+        parser = vdf.IncrementalParser()
+        parser.feed('"a"\n{\n"b" "c"\n')
+        self.assertRaises(SyntaxError, parser.close)
+
+        parser = vdf.IncrementalParser()
+        self.assertRaises(SyntaxError, parser.feed, '}\n')
+
+    def test_select_done(self):
+        parser = vdf.IncrementalParser(select=['a'])
+        parser.feed('"a" "1"\n"b" "2"\n')
+        self.assertFalse(parser.done)
+        self.assertEqual(parser.close(), {'a': '1'})
+
+        parser = vdf.IncrementalParser(select=['a'], stop_early=True)
+        parser.feed('"a" "1"\n"b" "2"\n')
+        self.assertTrue(parser.done)
+        parser.feed('}}}\n')
+        self.assertEqual(parser.close(), {'a': '1'})
+
+
+class testcase_parse_bytes(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, data):
+        path = os.path.join(self.tmpdir, 'test.vdf')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_loads_buffers(self):
+        for text in testcase_parse_engines.INPUTS:
+            if bytes is str:
+                # on Python 2, the inputs are bytes already, and start with every BOM
+                text = text.replace(vdf.BOMS, '\xef\xbb\xbf').decode('utf-8')
+
+            data = text.encode('utf-8')
+            for buf in (data, bytearray(data), memoryview(data)):
+                for kwargs in ({}, {'escaped': False}, {'mapper': vdf.VDFDict}, {'engine': 'regex'}):
+                    self.assertEqual(vdf.loads(buf, **kwargs), vdf.loads(text, **kwargs))
+
+    def test_loads_unicode(self):
+        # \s and case insensitive [a-z] match these as text, so they have to as UTF-8 too
+        text = u'\u3000"\u0430" "\u0431"\n\u2028key\u0131 val\u017f\u212a\u00a0\n"\u0432"\n{\n}\n'
+        # on Python 2, str is parsed as text
+        data = text.encode('utf-8') if bytes is not str else bytearray(text.encode('utf-8'))
+        self.assertEqual(vdf.loads(data), vdf.loads(text))
+
+    def test_loads_select(self):
+        text = 'a\n{\nb 1\nc 2\n}\nd\n{\nb 3\n}\n'
+        self.assertEqual(vdf.loads(text.encode('utf-8'), select=['*', 'b']), {'a': {'b': '1'}, 'd': {'b': '3'}})
+
+    def test_loads_raw(self):
+        text = u'"\u0430" {\n"k\\"ey" "v\\"al"\n"b" "\u0431"\n}\n"c" "1"\n'
+        data = text.encode('utf-8')
+        result = {u'\u0430'.encode('utf-8'): {b'k"ey': b'v"al', b'b': u'\u0431'.encode('utf-8')}, b'c': b'1'}
+
+        self.assertEqual(vdf.loads(data, raw=True), result)
+        self.assertEqual(vdf.loads(bytearray(data), raw=True), result)
+        self.assertEqual(vdf.loads(data, raw=True, escaped=False)[u'\u0430'.encode('utf-8')][b'k\\"ey'], b'v\\"al')
+        self.assertEqual(vdf.loads(data, raw=True, select=[u'\u0430', 'b']),
+                         {u'\u0430'.encode('utf-8'): {b'b': u'\u0431'.encode('utf-8')}})
+        self.assertEqual(vdf.loads(data, raw=True, select=['*', 'k"ey']),
+                         {u'\u0430'.encode('utf-8'): {b'k"ey': b'v"al'}})
+
+        result = vdf.loads(b'a {\nk v\n}\nb {\nk v\n}\n', raw=True, intern=True)
+        self.assertIs(list(result[b'a'])[0], list(result[b'b'])[0])
+        self.assertIs(result[b'a'][b'k'], result[b'b'][b'k'])
+
+        with self.assertRaises(TypeError):
+            vdf.loads(text, raw=True)
+
+    def test_syntax_error(self):
+        with self.assertRaises(SyntaxError) as ctx:
+            vdf.loads(u'"\u0430" "1"\n}\n'.encode('utf-8'))
+        self.assertEqual(ctx.exception.lineno, 2)
+
+        for test in testcase_VDF_other.INVALID:
+            self.assertRaises(SyntaxError, vdf.loads, test.encode('utf-8'))
+
+    def test_load_path(self):
+        text = u'"key" "\u0430\u0431\u0432"\n"\u0433" {\n"a" "b"\n}\n'
+
+        path = self.write(codecs.BOM_UTF8 + text.encode('utf-8'))
+        self.assertEqual(vdf.load_path(path), vdf.loads(text))
+        self.assertEqual(vdf.load_path(path, encoding='utf-8-sig', mapper=vdf.VDFDict),
+                         vdf.loads(text, mapper=vdf.VDFDict))
+
+        path = self.write(text.encode('utf-16'))
+        self.assertEqual(vdf.load_path(path, encoding='utf-16'), vdf.loads(text))
+
+    def test_load_path_empty(self):
+        self.assertEqual(vdf.load_path(self.write(b'')), {})
+
+    def test_load_path_syntax_error(self):
+        path = self.write(b'"a"\n{\n')
+
+        with self.assertRaises(SyntaxError) as ctx:
+            vdf.load_path(path)
+        self.assertEqual(ctx.exception.filename, path)
+
+
+class testcase_parse_intern(unittest.TestCase):
+    INPUT = 'a\n{\nname "value"\n}\nb\n{\nname "value"\n}\nc\n{\n"k\\"ey" "v\\"al"\n"k\\"ey" "v\\"al"\n}\n'
+
+    def assertShared(self, result):
+        self.assertIs(list(result['a'])[0], list(result['b'])[0])
+        self.assertIs(result['a']['name'], result['b']['name'])
+
+    def test_intern(self):
+        for kwargs in ({}, {'engine': 'regex'}, {'mapper': vdf.VDFDict, 'merge_duplicate_keys': False}):
+            result = vdf.loads(self.INPUT, intern=True, **kwargs)
+            self.assertEqual(result, vdf.loads(self.INPUT, **kwargs))
+            self.assertShared(result)
+
+        self.assertShared(vdf.loads(self.INPUT.encode('utf-8'), intern=True))
+        self.assertShared(vdf.loads(self.INPUT, intern=True, select=['*', 'name']))
+
+    def test_intern_escaped(self):
+        result = vdf.loads(self.INPUT, intern=True, mapper=vdf.VDFDict, merge_duplicate_keys=False)
+        (k1, v1), (k2, v2) = result['c'].items()
+        self.assertEqual(k1, 'k"ey')
+        self.assertIs(k1, k2)
+        self.assertIs(v1, v2)
+
+    @mock.patch('vdf._INTERN_TABLE_SIZE', 1)
+    def test_intern_table_size(self):
+        result = vdf.loads('a "x y"\nb "x y"\nc "z w"\nd "z w"\n', intern=True)
+        self.assertIs(result['a'], result['b'])
+        self.assertEqual(result['c'], result['d'])
+        self.assertIsNot(result['c'], result['d'])
+
+
+class testcase_include_resolver(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.resolver = vdf.IncludeResolver()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_base(self):
+        self.write('base.res', 'hud\n{\nbg {\nx 1\ny 2\n}\nlabel {\nx 3\n}\n}\n')
+        path = self.write('hud.res', '#base "base.res"\nhud\n{\nbg {\nx 5\n}\n}\n')
+
+        self.assertEqual(self.resolver.load(path), {'hud': {'bg': {'x': '5', 'y': '2'}, 'label': {'x': '3'}}})
+
+    def test_base_order(self):
+        self.write('a.res', 'k 1\na 1\n')
+        self.write('b.res', 'k 2\nb 2\n')
+        path = self.write('hud.res', '#base a.res\n#base b.res\n')
+
+        self.assertEqual(self.resolver.load(path), {'k': '1', 'a': '1', 'b': '2'})
+
+    def test_include(self):
+        self.write('sub/inc.res', 'hud\n{\nbg {\nx 1\n}\nlabel {\nx 3\n}\n}\n')
+        path = self.write('hud.res', '"#include" "sub\\inc.res"\nhud\n{\nbg {\nx 5\ny 2\n}\n}\n')
+
+        self.assertEqual(self.resolver.load(path), {'hud': {'bg': {'x': '1', 'y': '2'}, 'label': {'x': '3'}}})
+
+    def test_include_duplicates(self):
+        self.write('inc.res', 'a 2\n')
+        path = self.write('hud.res', '#include inc.res\na 1\n')
+
+        result = vdf.IncludeResolver(mapper=vdf.VDFDict).load(path)
+        self.assertEqual(result, vdf.VDFDict([('a', '1'), ('a', '2')]))
+
+    def test_nested(self):
+        self.write('ui/base2.res', 'a {\nc 3\n}\n')
+        self.write('ui/base.res', '#base base2.res\na {\nb 2\n}\n')
+        path = self.write('hud.res', '#base ui/base.res\na {\na 1\n}\nb {\n#base ui/base.res\n}\n')
+
+        self.assertEqual(self.resolver.load(path), {'a': {'a': '1', 'b': '2', 'c': '3'},
+                                                    'b': {'#base': 'ui/base.res'}})
+
+    def test_cache(self):
+        base = self.write('base.res', 'a 1\n')
+        paths = [self.write('hud%d.res' % i, '#base base.res\nb %d\n' % i) for i in range(3)]
+
+        with mock.patch.object(self.resolver, '_parse', wraps=self.resolver._parse) as parse:
+            for path in paths * 2:
+                self.assertEqual(self.resolver.load(path)['a'], '1')
+            self.assertEqual(parse.call_count, 4)
+
+            self.write('base.res', 'a 2 \n')
+            self.assertEqual(self.resolver.load(paths[0]), {'a': '2', 'b': '0'})
+            self.assertEqual(parse.call_count, 6)
+
+            self.resolver.clear()
+            self.resolver.load(base)
+            self.assertEqual(parse.call_count, 7)
+
+    def test_result_is_copy(self):
+        self.write('base.res', 'a {\nb 1\n}\n')
+        path = self.write('hud.res', '#base base.res\n')
+
+        self.resolver.load(path)['a']['b'] = '2'
+        self.assertEqual(self.resolver.load(path), {'a': {'b': '1'}})
+
+    def test_circular(self):
+        self.write('a.res', '#include b.res\n')
+        path = self.write('b.res', '#base a.res\n')
+
+        self.assertRaises(ValueError, self.resolver.load, path)
+
+    def test_missing(self):
+        path = self.write('hud.res', '#base missing.res\n')
+
+        self.assertRaises(EnvironmentError, self.resolver.load, path)
+
+
+class testcase_load_many(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_text(self):
+        paths = [self.write('%d.acf' % i, ('"AppState"\n{\n"appid" "%d"\n}\n' % i).encode('utf-8'))
+                 for i in range(20)]
+
+        results = list(vdf.load_many(paths, workers=2, chunksize=3))
+        self.assertEqual(results, [(path, vdf.load_path(path)) for path in paths])
+
+        results = vdf.load_many(paths, workers=2, ordered=False, mapper=vdf.VDFDict)
+        self.assertEqual(sorted(results), sorted((path, vdf.load_path(path, mapper=vdf.VDFDict)) for path in paths))
+
+    def test_binary(self):
+        data = vdf.binary_dumps({'a': {'b': 1, 'c': 'd'}})
+        paths = [self.write('%d.vdf' % i, data) for i in range(3)]
+
+        for path, result in vdf.load_many(paths, workers=2, binary=True):
+            self.assertEqual(result, {'a': {'b': 1, 'c': 'd'}})
+
+    def test_errors(self):
+        paths = [self.write('good.vdf', b'a b\n'), self.write('bad.vdf', b'a\n{\n'),
+                 os.path.join(self.tmpdir, 'missing.vdf')]
+
+        (_, good), (_, bad), (_, missing) = vdf.load_many(paths, workers=2)
+        self.assertEqual(good, {'a': 'b'})
+        self.assertIsInstance(bad, SyntaxError)
+        self.assertIsInstance(missing, EnvironmentError)
+
+    def test_mapper_assert(self):
+        self.assertRaises(TypeError, vdf.load_many, [], mapper=list)
+
+
+class testcase_parse_parallel(unittest.TestCase):
+    def setUp(self):
+        # split even the small test documents
+        self.min_range = vdf._PARALLEL_MIN_RANGE
+        vdf._PARALLEL_MIN_RANGE = 16
+
+    def tearDown(self):
+        vdf._PARALLEL_MIN_RANGE = self.min_range
+
+    def document(self):
+        items = ''.join('"%d"\n{\n"name" "item %d"\n"attributes"\n{\n"a" "%d"\n}\n}\n' % (i, i, i)
+                        for i in range(40))
+        return '"items_game"\n{\n"version" "1"\n"items"\n{\n%s}\n"items"\n{\n"40" { }\n}\n}\n' % items
+
+    def test_parse(self):
+        text = self.document()
+
+        for data in (text, text.encode('utf-8')):
+            self.assertEqual(vdf.loads(data, workers=2), vdf.loads(data))
+            self.assertEqual(vdf.loads(data, workers=2, mapper=vdf.VDFDict, merge_duplicate_keys=False),
+                             vdf.loads(data, mapper=vdf.VDFDict, merge_duplicate_keys=False))
+
+        result = vdf.loads(text, workers=2, intern=True)
+        self.assertIs(list(result['items_game']['items']['0'])[0], list(result['items_game']['items']['1'])[0])
+
+        data = text.replace('"version" "1"', '"ver\\"sion" "1\\\\"').encode('utf-8')
+        self.assertEqual(vdf.loads(data, workers=2, raw=True), vdf.loads(data, raw=True))
+
+    def test_syntax_error(self):
+        text = self.document().replace('"a" "7"\n', '"a" "7"\n"b"\n"c" "d"\n')
+
+        with self.assertRaises(SyntaxError) as serial:
+            vdf.loads(text)
+        with self.assertRaises(SyntaxError) as parallel:
+            vdf.loads(text, workers=2)
+        self.assertEqual(parallel.exception.lineno, serial.exception.lineno)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            vdf.loads(self.document(), workers=2, engine='regex')
+        with self.assertRaises(ValueError):
+            vdf.loads(self.document(), workers=2, select=['items_game'])
+
+
 class testcase_VDF_other(unittest.TestCase):
     def test_dumps_pretty_output(self):
         tests = [
@@ -523,27 +1130,26 @@ class testcase_VDF_other(unittest.TestCase):
         for test, expected in tests:
             self.assertEqual(vdf.dumps(test, pretty=True), expected)
 
-    def test_parse_exceptions(self):
-        tests = [
-
-            # expect bracket - invalid syntax
-            '"asd"\n"zxc" "333"\n"',
-            'asd\nzxc 333\n"',
+    INVALID = [
+        # expect bracket - invalid syntax
+        '"asd"\n"zxc" "333"\n"',
+        'asd\nzxc 333\n"',
 
-            # invalid syntax
-            '"asd" "123"\n"zxc" "333"\n"',
-            'asd 123\nzxc 333\n"',
-            '"asd\n\n\n\n\nzxc',
-            '"asd" "bbb\n\n\n\n\nzxc',
+        # invalid syntax
+        '"asd" "123"\n"zxc" "333"\n"',
+        'asd 123\nzxc 333\n"',
+        '"asd\n\n\n\n\nzxc',
+        '"asd" "bbb\n\n\n\n\nzxc',
 
-            # one too many closing parenthasis
-            '"asd"\n{\n"zxc" "123"\n}\n}\n}\n}\n',
-            'asd\n{\nzxc 123\n}\n}\n}\n}\n',
+        # one too many closing parenthasis
+        '"asd"\n{\n"zxc" "123"\n}\n}\n}\n}\n',
+        'asd\n{\nzxc 123\n}\n}\n}\n}\n',
 
-            # unclosed parenthasis
-            '"asd"\n{\n"zxc" "333"\n'
-            'asd\n{\nzxc 333\n'
-        ]
+        # unclosed parenthasis
+        '"asd"\n{\n"zxc" "333"\n'
+        'asd\n{\nzxc 333\n'
+    ]
 
-        for test in tests:
+    def test_parse_exceptions(self):
+        for test in self.INVALID:
             self.assertRaises(SyntaxError, vdf.loads, test)
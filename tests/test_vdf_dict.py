@@ -1,5 +1,9 @@
+import copy
+import pickle
 import unittest
+import weakref
 from vdf import VDFDict
+from vdf.vdict import _DELETED
 
 
 class VDFDictCase(unittest.TestCase):
@@ -136,6 +140,16 @@ class VDFDictCase(unittest.TestCase):
         self.assertEqual(VDFDict(a), VDFDict(a))
         self.assertNotEqual(VDFDict(a), VDFDict(a[1:]))
 
+    def test_eq_with_deleted_items(self):
+        a = VDFDict([("a", 1), ("b", 5), ("a", 11)])
+        b = VDFDict([("x", 0), ("a", 1), ("b", 5), ("a", 11)])
+        self.assertNotEqual(a, b)
+        del b["x"]
+        self.assertEqual(a, b)
+        self.assertEqual(list(b._iteritems()), list(a.items()))
+        del a[(1, "a")]
+        self.assertNotEqual(a, b)
+
     def test_clear(self):
         a = VDFDict([("1",2),("1",2),("5",3),("1",2)])
         a.clear()
@@ -187,6 +201,39 @@ class VDFDictCase(unittest.TestCase):
         b.update([("5",3),("1",2)])
         self.assertEqual(list(a.items()), list(b.items()))
 
+    def test_update_iterable(self):
+        a = VDFDict()
+        a.update((str(i % 2), i) for i in range(4))
+        a.update(iter([("1", 4)]))
+        self.assertEqual(list(a.items()), [("0", 0), ("1", 1), ("0", 2), ("1", 3), ("1", 4)])
+
+    def test_from_pairs(self):
+        a = VDFDict.from_pairs((str(i % 2), i) for i in range(4))
+        self.assertEqual(a, VDFDict([("0", 0), ("1", 1), ("0", 2), ("1", 3)]))
+        self.assertEqual(a.get_all_for("1"), [1, 3])
+        self.assertEqual(VDFDict.from_pairs([("a", 1), ("b", 2)]), VDFDict([("a", 1), ("b", 2)]))
+        self.assertEqual(VDFDict.from_pairs([]), VDFDict())
+
+        # indexed, as if set one by one
+        self.assertEqual(dict.__len__(a), 2)
+        self.assertEqual(dict(dict.items(a)), dict(dict.items(VDFDict(list(a.items())))))
+
+        # keys are checked as by update()
+        a = VDFDict.from_pairs([("a", 1), ("a", 2), ((1, "a"), 3)])
+        self.assertEqual(a.get_all_for("a"), [1, 3])
+        with self.assertRaises(TypeError):
+            VDFDict.from_pairs([("a", 1), (b"b" if bytes is not str else 5, 2)])
+        with self.assertRaises(TypeError):
+            VDFDict.from_pairs([(5, 1)])
+        with self.assertRaises(KeyError):
+            VDFDict.from_pairs([("a", 1), ((1, "a"), 2)])
+
+        class IncrementingDict(VDFDict):
+            def __setitem__(self, key, value):
+                VDFDict.__setitem__(self, key, value + 1)
+
+        self.assertEqual(list(IncrementingDict.from_pairs([("a", 1)]).items()), [("a", 2)])
+
     def test_update_exceptions(self):
         a = VDFDict()
         with self.assertRaises(TypeError):
@@ -292,3 +339,144 @@ class VDFDictCase(unittest.TestCase):
         # duplicate in nested dict
         d = VDFDict({'1': {'2': {'3': None}}})
         self.assertFalse(d.has_duplicates())
+
+    def test_compact(self):
+        a = VDFDict([('1', 11), ('1', 22), ('2', 33)])
+        self.assertFalse(hasattr(a, '__dict__'))
+        self.assertIs(weakref.ref(a)(), a)
+        self.assertTrue(a.has_duplicates())
+
+        del a[(0, '1')]
+        self.assertFalse(a.has_duplicates())
+        self.assertEqual(list(a.items()), [('1', 22), ('2', 33)])
+
+        a['1'] = 44
+        self.assertEqual(a.popitem(), ('1', 44))
+        self.assertEqual(a.get_all_for('1'), [22])
+        self.assertNotIn((1, '1'), a)
+
+    def test_pickle(self):
+        a = VDFDict([('1', 11), ('2', VDFDict([('3', 33), ('3', 44)])), ('1', 22)])
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            b = pickle.loads(pickle.dumps(a, protocol))
+            self.assertEqual(a, b)
+            self.assertEqual(b.get_all_for('1'), [11, 22])
+
+        self.assertEqual(copy.deepcopy(a), a)
+
+
+class VDFDictScalingCase(unittest.TestCase):
+    # deleting is O(1) amortized: the slots of the other items don't move, the last slot is always
+    # in use, and the slots are only compacted, which moves every item, once half of them are empty
+    SMALL = 1000
+    LARGE = 8000
+
+    def make(self, items):
+        moved = []
+
+        class CountingDict(VDFDict):
+            def _compact(self):
+                moved.append(len(self))
+                VDFDict._compact(self)
+
+        return CountingDict(items), moved
+
+    def assertSlots(self, d):
+        keys = d._VDFDict__keys
+        self.assertLessEqual(len(keys), len(d) * 2 + 1)
+        if keys:
+            self.assertIsNot(keys[-1], _DELETED)
+
+    def test_popitem(self):
+        items = [(str(i), i) for i in range(self.SMALL)]
+        d, moved = self.make(items)
+
+        while d:
+            self.assertEqual(d.popitem(), items.pop())
+            self.assertSlots(d)
+
+        # only trailing slots are freed, nothing is moved
+        self.assertEqual(moved, [])
+        self.assertEqual(d._VDFDict__keys, [])
+
+    def test_del_from_middle(self):
+        n = self.LARGE
+        d, moved = self.make([(str(i), i) for i in range(n)])
+
+        for i in list(range(n // 4, n * 3 // 4)) + list(range(n // 4)):
+            del d[str(i)]
+            self.assertSlots(d)
+
+        self.assertEqual(list(d.items()), [(str(i), i) for i in range(n * 3 // 4, n)])
+        self.assertTrue(moved)
+        self.assertLessEqual(sum(moved), n)
+
+    def test_pop_duplicates(self):
+        # removing a duplicate shifts the slots of the later duplicates in the key's list,
+        # the items in the dict are moved no more than with distinct keys
+        n = self.LARGE
+        d, moved = self.make([(str(i % 10), i) for i in range(n)])
+
+        for i in range(n * 3 // 4):
+            self.assertEqual(d.pop(str(i % 10)), i)
+            self.assertSlots(d)
+
+        self.assertEqual(d.get_all_for('3'), list(range(n * 3 // 4 + 3, n, 10)))
+        self.assertTrue(moved)
+        self.assertLessEqual(sum(moved), n)
+
+    def test_compact_subclass(self):
+        class IncrementingDict(VDFDict):
+            def __setitem__(self, key, value):
+                VDFDict.__setitem__(self, key, value + 1)
+
+        d = IncrementingDict([(str(i), 0) for i in range(8)])
+        for i in range(5):
+            del d[str(i)]
+
+        self.assertEqual(list(d.items()), [('5', 1), ('6', 1), ('7', 1)])
+        self.assertEqual(d['6'], 1)
+
+    def test_all_for_touches_only_matches(self):
+        class CountingList(list):
+            def __init__(self, items):
+                list.__init__(self, items)
+                self.touched = 0
+
+            def __getitem__(self, idx):
+                self.touched += 1
+                return list.__getitem__(self, idx)
+
+            def __setitem__(self, idx, value):
+                self.touched += 1
+                list.__setitem__(self, idx, value)
+
+        # the same 500 duplicates, among many other keys
+        n = self.SMALL * 64
+        d = VDFDict([('attr' if i % (n // 500) == 0 else str(i), i) for i in range(n)])
+        d._VDFDict__keys = keys = CountingList(d._VDFDict__keys)
+        d._VDFDict__values = values = CountingList(d._VDFDict__values)
+
+        self.assertEqual(d.get_all_for('attr'), list(range(0, n, n // 500)))
+        self.assertEqual((keys.touched, values.touched), (0, 500))
+
+        keys.touched = values.touched = 0
+        d.remove_all_for('attr')
+        # and the last slot, to see whether it has to be trimmed
+        self.assertEqual((keys.touched, values.touched), (501, 500))
+
+        self.assertEqual(d.get_all_for('attr'), [])
+        self.assertEqual(len(d), n - 500)
+
+    def test_deleted_slots_are_compacted(self):
+        items = [(str(i % 3), i) for i in range(1000)]
+        a = VDFDict(items)
+
+        # every other duplicate of each key
+        for key in '012':
+            for idx in range(len(a.get_all_for(key)) // 2):
+                del a[(idx + 1, key)]
+
+        self.assertEqual(list(a.items()), [item for i, item in enumerate(items) if i // 3 % 2 == 0])
+        self.assertLessEqual(len(a._VDFDict__keys), len(a) * 2 + 1)
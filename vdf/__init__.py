@@ -4,12 +4,21 @@ Module for deserializing/serializing to and from VDF
 __version__ = "3.4"
 __author__ = "Rossen Georgiev"
 
+import os
 import re
 import sys
+import mmap
+import codecs
 import struct
 from binascii import crc32
-from io import BytesIO
+from io import BytesIO, FileIO
 from io import StringIO as unicodeIO
+import multiprocessing
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 try:
     from collections.abc import Mapping
@@ -17,11 +26,14 @@ except:
     from collections import Mapping
 
 from vdf.vdict import VDFDict
+from vdf.appinfo import AppInfo
+from vdf.columns import extract_columns
 
 # Py2 & Py3 compatibility
 if sys.version_info[0] >= 3:
     string_type = str
     int_type = int
+    file_type = FileIO
     BOMS = '\ufffe\ufeff'
 
     def strip_bom(line):
@@ -30,6 +42,7 @@ else:
     from StringIO import StringIO as strIO
     string_type = basestring
     int_type = long
+    file_type = (file, FileIO)
     BOMS = '\xef\xbb\xbf\xff\xfe\xfe\xff'
     BOMS_UNICODE = '\\ufffe\\ufeff'.decode('unicode-escape')
 
@@ -62,10 +75,774 @@ def _escape(text):
     return re.sub(r"[\n\t\v\b\r\f\a\\\?\"']", _re_escape_match, text)
 
 def _unescape(text):
+    if '\\' not in text:
+        return text
     return re.sub(r"(\\n|\\t|\\v|\\b|\\r|\\f|\\a|\\\\|\\\?|\\\"|\\')", _re_unescape_match, text)
 
+_unescape_bytes_map = dict((k.encode('ascii'), v.encode('ascii')) for k, v in _unescape_char_map.items())
+_re_unescape_bytes = re.compile(br"(\\n|\\t|\\v|\\b|\\r|\\f|\\a|\\\\|\\\?|\\\"|\\')")
+
+def _re_unescape_bytes_match(m):
+    return _unescape_bytes_map[m.group()]
+
+def _unescape_raw(data):
+    # _unescape for bytes
+    if b'\\' not in data:
+        return data
+    return _re_unescape_bytes.sub(_re_unescape_bytes_match, data)
+
+# interning
+_INTERN_TABLE_SIZE = 65536
+
+def _string_table(size):
+    table = {}
+
+    def lookup(text):
+        try:
+            return table[text]
+        except KeyError:
+            if len(table) < size:
+                table[text] = text
+            return text
+
+    return lookup
+
+def _interners(intern, raw=False):
+    """
+    Returns ``(intern_key, intern_value)`` functions for one parse, or ``(None, None)``
+
+    Keys go through ``sys.intern``, as the same few keys repeat in every document.
+    Values are shared through a table, which stops growing at ``_INTERN_TABLE_SIZE`` entries.
+    When ``raw`` is set, keys are ``bytes``, which go through a table as well.
+    """
+    if not intern:
+        return None, None
+
+    # python 2 only interns byte strings
+    if hasattr(sys, 'intern') and not raw:
+        intern_key = sys.intern
+    else:
+        intern_key = _string_table(_INTERN_TABLE_SIZE)
+    return intern_key, _string_table(_INTERN_TABLE_SIZE)
+
 # parsing and dumping for KV1
-def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
+_KEY_CHARS = r'[a-z0-9\-\_\\\?$%<>]'
+_VALUE_CHARS = r'[a-z0-9\-\_\\\?\*\.$<> ]'
+_KEYVALUE_PATTERN = (r'("(?P<qkey>(?:\\.|[^\\"])*)"|(?P<key>#?' + _KEY_CHARS + r'+))'
+                     r'([ \t]*('
+                     r'"(?P<qval>(?:\\.|[^\\"])*)(?P<vq_end>")?'
+                     r'|(?P<val>(?:(?<!/)/(?!/)|' + _VALUE_CHARS + r')+)'
+                     r'|(?P<sblock>{[ \t]*)(?P<eblock>})?'
+                     r'))?')
+_re_keyvalue = re.compile(_KEYVALUE_PATTERN, flags=re.I)
+# the common statements: comments and brackets, or a quoted key followed by a quoted value,
+# an opening bracket or the end of line. Where it matches, _re_keyvalue matches the same way
+_STATEMENT_FAST_PATTERN = r'\s*(?:([/{}])|"([^"\\]*)"[ \t]*(?:"([^"\\]*)"|({[ \t]*)(})?|(?=[\r\n])))'
+# when skipping a block: whole lines that don't change the depth (values, empty blocks, comments,
+# opening brackets), followed by a line closing a block or a simple key opening one
+_SKIP_LINES_PATTERN = r'(?:[ \t\r\f\v]*(?:"[^"\\\n]*"[ \t]*(?:"[^"\\\n]*"|{[ \t]*})[^\n]*|/[^\n]*|{[^\n]*)?\n)*'
+_SKIP_BLOCK_PATTERN = (_SKIP_LINES_PATTERN + r'[ \t\r\f\v]*(?:'
+                       r'(?P<close>})[^\n]*\n'
+                       r'|"[^"\\\n]*"[ \t]*(?:{(?![ \t]*})[^\n]*\n'
+                       r'|\r?\n(?:[ \t\r\f\v]*(?:/[^\n]*)?\n)*[ \t\r\f\v]*{[^\n]*\n)(?P<open>))')
+
+# UTF-8 forms of the characters that \s* matches in unicode patterns, mostly ascii
+_UTF8_SPACES = (r'[\t\n\x0b\x0c\r\x1c-\x1f ]*(?:(?:\xc2[\x85\xa0]|\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]'
+                r'|\xe2\x81\x9f|\xe3\x80\x80)[\t\n\x0b\x0c\r\x1c-\x1f ]*)*')
+# UTF-8 forms of the non-ascii letters that [a-z] matches in case-insensitive unicode patterns
+_UTF8_FOLDED = r'|\xc4[\xb0\xb1]|\xc5\xbf|\xe2\x84\xaa'
+
+def _utf8_pattern(pattern):
+    """
+    Translate a unicode pattern to a bytes pattern matching the same UTF-8 encoded text
+    """
+    pattern = pattern.replace(r'\s*', _UTF8_SPACES)
+    pattern = pattern.replace(_KEY_CHARS, '(?:%s%s)' % (_KEY_CHARS, _UTF8_FOLDED))
+    pattern = pattern.replace(_VALUE_CHARS, '(?:%s%s)' % (_VALUE_CHARS, _UTF8_FOLDED))
+    return pattern.encode('latin-1')
+
+
+class _TextGrammar(object):
+    """
+    Compiled patterns and literals used by ``_TextTokenizer``, for either text or UTF-8 bytes
+    """
+    def __init__(self, convert, flags, bom):
+        self.statement_fast = re.compile(convert(_STATEMENT_FAST_PATTERN), flags=flags)
+        self.statement = re.compile(convert(r'\s*' + _KEYVALUE_PATTERN), flags=flags | re.I)
+        self.whitespace = re.compile(convert(r'\s*'), flags=flags)
+        self.skip_lines = re.compile(convert(_SKIP_LINES_PATTERN))
+        self.skip_block = re.compile(convert(_SKIP_BLOCK_PATTERN))
+        self.bom = bom and re.compile(bom)
+        self.newline, self.quote, self.slash, self.open, self.close = map(convert, '\n"/{}')
+
+_TEXT_GRAMMAR = _TextGrammar(lambda pattern: pattern, re.U, None)
+# the same as strip_bom(), the BOMs encoded as UTF-8
+_UTF8_GRAMMAR = _TextGrammar(_utf8_pattern, 0, b'(?:\xef\xbb\xbf|\xef\xbf\xbe)*')
+
+_TEXT_CHUNK_SIZE = 65536
+
+def _fp_name(fp):
+    return getattr(fp, 'name', '<%s>' % fp.__class__.__name__)
+
+def _line_at(buf, pos, grammar):
+    eol = buf.find(grammar.newline, pos)
+    line = buf[pos:] if eol == -1 else buf[pos:eol + 1]
+    return line if grammar is _TEXT_GRAMMAR else line.decode('utf-8', 'replace')
+
+def _last_line_start(buf, grammar):
+    # start of the last line that isn't blank
+    end = len(buf)
+
+    while end:
+        start = end - 1
+        # step back a whole UTF-8 character
+        while start and grammar is _UTF8_GRAMMAR and 0x80 <= ord(buf[start:start + 1]) < 0xc0:
+            start -= 1
+        if grammar.whitespace.match(buf, start, end).end() != end:
+            break
+        end = start
+
+    return buf.rfind(grammar.newline, 0, end) + 1
+
+
+class _TextTokenizer(object):
+    """
+    Single pass tokenizer for text VDF
+
+    Input is appended with ``feed()`` and ``tokens()`` yields ``(event, key, value, pos)``
+    tuples, where ``event`` is one of ``start_map``, ``value`` or ``end_map``. Keys and values
+    are yielded raw, as they appear in the source (no unescaping). ``lineno_at(pos)`` gives
+    the line number for a yielded position, as long as it is called in order.
+
+    The buffer is walked once, keeping the line oriented semantics of the regex engine:
+    one statement per line and the remainder of the line is ignored.
+    When ``final`` is ``False`` and a statement is not yet terminated by a newline,
+    ``tokens()`` stops and resumes from that statement once more data is fed.
+
+    Setting ``skip_block`` after receiving a ``start_map`` skips that block. No tokens are
+    yielded for it, including its ``end_map``, and runs of plain lines are consumed in bulk.
+    When ``skip_limit`` is set, a block that turns out to be larger is not skipped after all:
+    ``skip_rewound`` is set and the tokens of the block follow.
+
+    Bytes like input (``bytes``, ``bytearray`` or ``mmap``) is tokenized as UTF-8 without
+    decoding it first. Only the keys and values that are yielded get decoded with ``encoding``.
+    """
+    def __init__(self, name, encoding='utf-8'):
+        self.name = name
+        self.encoding = encoding
+        self.grammar = _TEXT_GRAMMAR
+        self.buf = ''
+        self.pos = 0
+        self.depth = 0
+        self.expect_bracket = False
+        self.skip_block = False
+        self.skip_until = -1
+        self.skip_limit = None
+        self.skip_rewound = False
+        self.bom = True
+        self.pending = []
+        self.pending_size = 0
+        self.stalled = 0
+        self.line_pos = 0
+        self.line_no = 1
+
+    def feed(self, data):
+        self.pending.append(data)
+        self.pending_size += len(data)
+
+    def _count_lines(self, start, end):
+        buf = self.buf
+        # mmap has no count()
+        if hasattr(buf, 'count'):
+            return buf.count(self.grammar.newline, start, end)
+        return buf[start:end].count(self.grammar.newline)
+
+    def _advance_lines(self, pos):
+        if pos >= self.line_pos:
+            self.line_no += self._count_lines(self.line_pos, pos)
+        else:
+            self.line_no -= self._count_lines(pos, self.line_pos)
+        self.line_pos = pos
+
+    def lineno_at(self, pos):
+        self._advance_lines(self.grammar.whitespace.match(self.buf, pos).end())
+        return self.line_no
+
+    def _flush(self, final):
+        # a stalled statement is rescanned from its start, so wait until the buffered data
+        # at least doubles before trying again. That keeps long multi-line values linear.
+        if not self.pending or (not final and self.pending_size < self.stalled):
+            return False
+
+        self._advance_lines(self.pos)
+
+        parts = self.pending
+        if self.pos < len(self.buf):
+            parts.insert(0, self.buf[self.pos:])
+
+        # a single buffer is used as is, so a mmap is never copied
+        self.buf = parts[0] if len(parts) == 1 else parts[0][:0].join(parts)
+        # without an encoding, the input is bytes, which is str on Python 2
+        if isinstance(self.buf, string_type) and self.encoding is not None:
+            self.grammar = _TEXT_GRAMMAR
+        else:
+            self.grammar = _UTF8_GRAMMAR
+        self.pos = self.line_pos = 0
+        self.pending = []
+        self.pending_size = 0
+        return True
+
+    def _error(self, message, offset, pos):
+        lineno = self.lineno_at(pos)
+        return SyntaxError(message, (self.name, lineno, offset, _line_at(self.buf, self.line_pos, self.grammar)))
+
+    def tokens(self, final=False):
+        if not self._flush(final) and not final:
+            return
+
+        buf = self.buf
+        n = len(buf)
+        pos = self.pos
+        depth = self.depth
+        expect_bracket = self.expect_bracket
+        skip_until = self.skip_until
+        grammar = self.grammar
+
+        if self.bom:
+            if n == 0 and not final:
+                return
+            if grammar.bom is None:
+                head = buf[pos:pos + 16]
+                pos += len(head) - len(strip_bom(head))
+            else:
+                pos = grammar.bom.match(buf, pos).end()
+            self.bom = pos == n and not final
+            self.line_pos = pos
+
+        fast_match = grammar.statement_fast.match
+        full_match = grammar.statement.match
+        skip_match = grammar.skip_block.match
+        find = buf.find
+        newline, quote, slash, open_bracket, close_bracket = (grammar.newline, grammar.quote, grammar.slash,
+                                                              grammar.open, grammar.close)
+        encoding = None if grammar is _TEXT_GRAMMAR else self.encoding
+        stalled = False
+        # where the current skip can be rewound to, once it passes rewind_limit
+        # (-1 when it just started, -2 when it started in an earlier call)
+        rewind = -2
+        rewind_limit = n
+
+        try:
+            while True:
+                if skip_until >= 0 and not expect_bracket:
+                    if rewind == -1:
+                        rewind, rewind_depth = pos, depth
+                        rewind_limit = pos + self.skip_limit
+
+                    match = skip_match(buf, pos)
+
+                    while match is not None:
+                        pos = match.end()
+
+                        if match.lastgroup == 'open':
+                            depth += 1
+                        else:
+                            depth -= 1
+                            if depth == skip_until:
+                                skip_until = -1
+                                break
+
+                        if pos > rewind_limit:
+                            break
+
+                        match = skip_match(buf, pos)
+
+                    if skip_until < 0:
+                        continue
+
+                    if pos > rewind_limit:
+                        pos, depth = rewind, rewind_depth
+                        skip_until = -1
+                        rewind_limit = n
+                        self.skip_rewound = True
+                        continue
+
+                    # the next statement needs a closer look
+                    pos = grammar.skip_lines.match(buf, pos).end()
+
+                match = fast_match(buf, pos)
+
+                if match is not None:
+                    ctl, key, val, sblock, eblock = match.groups()
+                    unterminated = False
+                else:
+                    ctl = None
+                    match = full_match(buf, pos)
+
+                    if match is None:
+                        start = grammar.whitespace.match(buf, pos).end()
+
+                        if start >= n:
+                            pos = n
+                            break
+                        if expect_bracket:
+                            raise self._error("vdf.parse: expected openning bracket", 1, pos)
+                        # only an open quoted key or a lone '#' at the end can still match
+                        if final or (buf[start:start + 1] != quote and start + 1 < n):
+                            raise self._error("vdf.parse: unexpected EOF (open key quote?)", 0, pos)
+
+                        stalled = True
+                        break
+
+                    key, qkey, val, vq_end, uval, sblock, eblock = match.group(
+                        'key', 'qkey', 'qval', 'vq_end', 'val', 'sblock', 'eblock')
+
+                    if qkey is not None:
+                        key = qkey
+
+                    unterminated = val is not None and vq_end is None
+
+                    if val is None and uval is not None:
+                        val = uval.rstrip()
+                        if not val:
+                            val = None
+
+                if expect_bracket and ctl != slash and ctl != open_bracket:
+                    raise self._error("vdf.parse: expected openning bracket", 1, pos)
+
+                # the rest of the line is ignored, wait until we have all of it
+                eol = find(newline, match.end())
+
+                if eol == -1:
+                    if not final:
+                        stalled = True
+                        break
+                    eol = n - 1
+
+                if unterminated:
+                    raise self._error("vdf.parse: unexpected EOF (open quote for value?)", 0, pos)
+
+                stmt_pos = pos
+                pos = eol + 1
+
+                if ctl is not None:
+                    # one level deeper
+                    if ctl == open_bracket:
+                        expect_bracket = False
+                    # one level back
+                    elif ctl == close_bracket:
+                        if not depth:
+                            raise self._error("vdf.parse: one too many closing parenthasis", 0, stmt_pos)
+                        depth -= 1
+
+                        if skip_until < 0:
+                            yield ('end_map', None, None, stmt_pos)
+                        elif skip_until == depth:
+                            skip_until = -1
+
+                    # comment lines are skipped
+                    continue
+
+                if encoding is not None and skip_until < 0:
+                    key = key.decode(encoding)
+                    if val is not None:
+                        val = val.decode(encoding)
+
+                # we have a key with value in parenthesis (level deeper)
+                if val is None:
+                    if skip_until < 0:
+                        yield ('start_map', key, None, stmt_pos)
+
+                        if self.skip_block:
+                            self.skip_block = False
+                            skip_until = depth
+                            if self.skip_limit is not None:
+                                rewind = -1
+
+                    if eblock is None:
+                        # only expect a bracket if it's not already closed or on the same line
+                        depth += 1
+                        if sblock is None:
+                            expect_bracket = True
+                    elif skip_until < 0:
+                        yield ('end_map', None, None, stmt_pos)
+                    elif skip_until == depth:
+                        skip_until = -1
+                elif skip_until < 0:
+                    yield ('value', key, val, stmt_pos)
+        finally:
+            self.pos = pos
+            self.depth = depth
+            self.expect_bracket = expect_bracket
+            self.skip_until = skip_until
+            self.stalled = (n - pos) if stalled else 0
+
+        if final and depth:
+            # point at the last line, not past the final newline
+            pos = _last_line_start(buf, grammar)
+            raise self._error("vdf.parse: unclosed parenthasis or quotes (EOF)", 0, pos)
+
+
+def _iter_text_chunks(fp, size=_TEXT_CHUNK_SIZE):
+    read = getattr(fp, 'read', None)
+
+    if read is None:
+        for line in fp:
+            yield line
+        return
+
+    while True:
+        chunk = read(size)
+        if not chunk:
+            break
+        yield chunk
+
+def _bulk_mapper(mapper, raw=False):
+    # VDFDict nodes are filled through VDFDict._builder(), unless a subclass changes how items are set.
+    # Raw keys are bytes on Python 3, which are left to VDFDict.__setitem__ to reject.
+    return (issubclass(mapper, VDFDict) and mapper.__setitem__ == VDFDict.__setitem__
+            and not (raw and bytes is not str))
+
+def _build_tree(tokens, stack, mapper, merge_duplicate_keys, escaped, interners, raw=False):
+    if _bulk_mapper(mapper, raw):
+        return _build_bulk_tree(tokens, stack, mapper, merge_duplicate_keys, escaped, interners, raw)
+
+    intern_key, intern_value = interners
+    backslash, unescape = ('\\', _unescape) if not raw else (b'\\', _unescape_raw)
+
+    for event, key, val, _ in tokens:
+        if event == 'end_map':
+            stack.pop()
+            continue
+
+        if escaped and backslash in key:
+            key = unescape(key)
+        if intern_key is not None:
+            key = intern_key(key)
+
+        if event == 'value':
+            if escaped and backslash in val:
+                val = unescape(val)
+            if intern_value is not None:
+                val = intern_value(val)
+            stack[-1][key] = val
+        else:
+            if merge_duplicate_keys and key in stack[-1]:
+                _m = stack[-1][key]
+                # we've descended a level deeper, if value is str, we have to overwrite it to mapper
+                if not isinstance(_m, mapper):
+                    _m = stack[-1][key] = mapper()
+            else:
+                _m = mapper()
+                stack[-1][key] = _m
+            stack.append(_m)
+
+def _build_bulk_tree(tokens, stack, mapper, merge_duplicate_keys, escaped, interners, raw=False):
+    # _build_tree for VDFDict, items are appended to the open nodes and indexed when they are closed
+    intern_key, intern_value = interners
+    backslash, unescape = ('\\', _unescape) if not raw else (b'\\', _unescape_raw)
+    # frame: [node, append_key, append_value, start of the keys that aren't indexed yet]
+    frames = [[node] + list(node._builder()) for node in stack]
+    node, append_key, append_value, _ = frame = frames[-1]
+
+    try:
+        for event, key, val, _ in tokens:
+            if event == 'end_map':
+                node._index(frame[3])
+                frames.pop()
+                stack.pop()
+                node, append_key, append_value, _ = frame = frames[-1]
+                continue
+
+            if escaped and backslash in key:
+                key = unescape(key)
+            if intern_key is not None:
+                key = intern_key(key)
+
+            if event == 'value':
+                if escaped and backslash in val:
+                    val = unescape(val)
+                if intern_value is not None:
+                    val = intern_value(val)
+                append_key(key)
+                append_value(val)
+                continue
+
+            _m = None
+
+            if merge_duplicate_keys:
+                frame[3] = node._index(frame[3])
+                _m = node.get(key)
+
+            if not isinstance(_m, mapper):
+                _m = mapper()
+                append_key(key)
+                append_value(_m)
+
+            stack.append(_m)
+            node, append_key, append_value, _ = frame = [_m] + list(_m._builder())
+            frames.append(frame)
+    finally:
+        # the nodes that are still open are used between calls, e.g. by IncrementalParser
+        for frame in frames:
+            frame[0]._index(frame[3])
+
+def _normalize_paths(select):
+    if not isinstance(select, (list, tuple)) or not select:
+        raise TypeError("Expected select to be a list of keys or a list of such lists")
+
+    if all(isinstance(key, string_type) for key in select):
+        select = [select]
+
+    paths = []
+
+    for path in select:
+        if not isinstance(path, (list, tuple)) or not all(isinstance(key, string_type) for key in path):
+            raise TypeError("Expected select path to be a list of str, got %s" % repr(path))
+        if not path:
+            raise ValueError("Expected select path to have at least one key")
+        paths.append(tuple(path))
+
+    return tuple(paths)
+
+
+class _PathSelection(object):
+    """
+    Builds only the parts of the tree that match the selected paths
+
+    ``consume()`` takes tokens from ``_TextTokenizer`` and, with ``stop_early``, returns ``True``
+    once every path is complete. A path is complete when the node at its leading keys (up to
+    the first ``*``) has been closed, later duplicates of that node are not looked at then.
+    Subtrees that can't match are skipped by the tokenizer, without unescaping their strings.
+    """
+    def __init__(self, tokenizer, paths, root, mapper, merge_duplicate_keys, escaped, interners, raw=False,
+                 stop_early=False):
+        self.tokenizer = tokenizer
+        self.paths = paths
+        self.literal = [path.index('*') if '*' in path else len(path) for path in paths]
+        self.pending = set(range(len(paths)))
+        self.stop_early = stop_early
+        self.mapper = mapper
+        self.merge_duplicate_keys = merge_duplicate_keys
+        self.escaped = escaped
+        self.backslash, self.unescape = ('\\', _unescape) if not raw else (b'\\', _unescape_raw)
+        self.intern_key, self.intern_value = interners
+        self.matchers = {}
+        # frame: [node or None until something matches, key, parent frame, matcher]
+        self.frames = [[root, None, None, self._matcher(tuple(range(len(paths))), 0)]]
+        self.capture = []
+        self.capture_paths = ()
+
+    def _child(self, node, key):
+        if self.merge_duplicate_keys and key in node:
+            _m = node[key]
+            if isinstance(_m, self.mapper):
+                return _m
+
+        _m = node[key] = self.mapper()
+        return _m
+
+    def _node(self, frame):
+        if frame[0] is None:
+            frame[0] = self._child(self._node(frame[2]), frame[1])
+        return frame[0]
+
+    def _built(self, frame):
+        # the node of frame without building it, None when it isn't there yet.
+        # With merge_duplicate_keys, an earlier block with the same key may have built it.
+        if frame[0] is None and self.merge_duplicate_keys:
+            node = self._built(frame[2])
+            _m = node.get(frame[1]) if node is not None else None
+            if isinstance(_m, self.mapper):
+                frame[0] = _m
+        return frame[0]
+
+    def _replaced(self, node, key):
+        # an item that isn't selected replaces what was built under the same key, as in _build_tree,
+        # except in VDFDict, where it's added as a duplicate
+        if node is not None and key in node and not isinstance(node, VDFDict):
+            del node[key]
+
+    def _value(self, val):
+        if self.escaped:
+            val = self.unescape(val)
+        if self.intern_value is not None:
+            val = self.intern_value(val)
+        return val
+
+    def _matcher(self, active, depth):
+        # maps a child key to the paths it matches and whether one of them ends there
+        try:
+            return self.matchers[active, depth]
+        except KeyError:
+            pass
+
+        def match(keys):
+            matched = tuple(p for p in active if self.paths[p][depth] in keys)
+            return matched, any(len(self.paths[p]) == depth + 1 for p in matched)
+
+        wild = match(('*',))
+        table = dict((key, match((key, '*'))) for key in set(self.paths[p][depth] for p in active))
+        matcher = self.matchers[active, depth] = (table, wild, active)
+        return matcher
+
+    def _complete(self, matched, depth):
+        for p in matched:
+            if self.literal[p] >= depth:
+                self.pending.discard(p)
+        return self.stop_early and not self.pending
+
+    def consume(self, tokens):
+        frames = self.frames
+        capture = self.capture
+        escaped = self.escaped
+        backslash, unescape = self.backslash, self.unescape
+        intern_key = self.intern_key
+
+        for event, key, val, _ in tokens:
+            if event == 'end_map':
+                if capture:
+                    capture.pop()
+                    if not capture and self._complete(self.capture_paths, len(frames)):
+                        return True
+                else:
+                    frame = frames.pop()
+                    if self._complete(frame[3][2], len(frames)):
+                        return True
+                continue
+
+            if escaped and backslash in key:
+                key = unescape(key)
+            if intern_key is not None:
+                key = intern_key(key)
+
+            # inside a selected subtree, everything is kept
+            if capture:
+                if event == 'value':
+                    capture[-1][key] = self._value(val)
+                else:
+                    capture.append(self._child(capture[-1], key))
+                continue
+
+            frame = frames[-1]
+            table, wild, _ = frame[3]
+            matched, selected = table.get(key, wild)
+
+            if not matched:
+                if event == 'start_map':
+                    self.tokenizer.skip_block = True
+                continue
+
+            if event == 'value':
+                if selected:
+                    self._node(frame)[key] = self._value(val)
+                    if self._complete(matched, len(frames)):
+                        return True
+                else:
+                    self._replaced(self._built(frame), key)
+            elif selected:
+                capture.append(self._child(self._node(frame), key))
+                self.capture_paths = matched
+            else:
+                if not self.merge_duplicate_keys:
+                    self._replaced(frame[0], key)
+                frames.append([None, key, frame, self._matcher(matched, len(frames))])
+
+        return False
+
+
+def _consumer(tokenizer, root, mapper, merge_duplicate_keys, escaped, select, intern, stop_early=False):
+    # without an encoding, keys and values are left as bytes
+    raw = tokenizer.encoding is None
+    interners = _interners(intern, raw)
+
+    if select is None:
+        stack = [root]
+        consume = lambda tokens: _build_tree(tokens, stack, mapper, merge_duplicate_keys, escaped, interners, raw)
+    else:
+        paths = _normalize_paths(select)
+
+        if raw:
+            paths = tuple(tuple(key if key == '*' else _binary_key(key) for key in path) for path in paths)
+
+        consume = _PathSelection(tokenizer, paths, root, mapper, merge_duplicate_keys, escaped, interners,
+                                 raw, stop_early).consume
+
+    return consume
+
+
+class IncrementalParser(object):
+    """
+    Push style parser for text VDF, for input that arrives in chunks
+
+    .. code:: python
+
+        parser = vdf.IncrementalParser()
+        for chunk in sock_chunks:
+            parser.feed(chunk)
+        d = parser.close()
+
+    ``feed()`` parses everything it can and keeps incomplete statements until the next chunk.
+    ``close()`` parses the remainder and returns the result. ``bytes`` and ``bytearray`` chunks are
+    decoded incrementally with ``encoding``, so multi-byte characters may be split between chunks.
+    On Python 2, ``str`` chunks are text and are parsed as they are, like the lines ``parse`` reads,
+    only ``bytearray`` chunks are decoded.
+
+    ``mapper``, ``merge_duplicate_keys``, ``escaped``, ``select``, ``intern`` and ``stop_early`` are
+    the same as for ``parse``. With ``stop_early``, ``done`` becomes ``True`` once every ``select`` path
+    is complete, further input is ignored.
+    """
+    def __init__(self, mapper=dict, merge_duplicate_keys=True, escaped=True, select=None,
+                 encoding='utf-8', name='<IncrementalParser>', intern=False, stop_early=False):
+        if not issubclass(mapper, Mapping):
+            raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+        self.root = mapper()
+        self.done = False
+        self.closed = False
+        self._tokenizer = _TextTokenizer(name)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._consume = _consumer(self._tokenizer, self.root, mapper, merge_duplicate_keys, escaped, select, intern,
+                                  stop_early)
+
+    def feed(self, data):
+        """
+        Parse the next chunk of ``data`` (``str``, ``bytes`` or ``bytearray``)
+        """
+        if self.closed:
+            raise ValueError("feed() called after close()")
+        if self.done:
+            return
+
+        if isinstance(data, (bytes, bytearray)) and not isinstance(data, string_type):
+            data = self._decoder.decode(data)
+        if not isinstance(data, string_type):
+            raise TypeError("Expected data to be a str or bytes, got %s" % type(data))
+
+        self._tokenizer.feed(data)
+
+        if self._consume(self._tokenizer.tokens()):
+            self.done = True
+
+    def close(self):
+        """
+        Parse any remaining input and return the result
+        """
+        if not self.closed:
+            self.closed = True
+
+            if not self.done:
+                tail = self._decoder.decode(b'', final=True)
+                if tail:
+                    self._tokenizer.feed(tail)
+
+                self._consume(self._tokenizer.tokens(final=True))
+
+        return self.root
+
+
+def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True, engine='scanner', select=None,
+          intern=False, workers=None, stop_early=False):
     """
     Deserialize ``s`` (a ``str`` or ``unicode`` instance containing a VDF)
     to a Python object.
@@ -77,22 +854,64 @@ def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
     ``merge_duplicate_keys`` when ``True`` will merge multiple KeyValue lists with the
     same key into one instead of overwriting. You can se this to ``False`` if you are
     using ``VDFDict`` and need to preserve the duplicates.
+
+    ``engine`` selects the parser implementation. ``scanner`` (default) walks the input
+    once in linear time. ``regex`` is the previous line by line implementation, which
+    rematches the line each time a quoted string spans another line. The two report
+    the same ``SyntaxError`` positions, except after a quoted string that spans lines:
+    ``regex`` doesn't count the lines it continued on, so ``lineno`` falls short by that many.
+    ``scanner`` reports the actual line.
+
+    ``select`` is a path as a list of keys, where ``*`` matches any key
+    (e.g. ``['items_game', 'items', '*', 'name']``), or a list of such paths.
+    Only the matching subtrees and their parents are built, everything else is skipped.
+    The whole input is still read, so the result is the same as the matching part of a full parse.
+
+    ``stop_early`` when ``True`` stops reading once every ``select`` path is complete, i.e. the node
+    at its leading keys (up to the first ``*``) has been closed. Only the first occurrence of that node
+    is used then, later duplicates, that would be merged in or overwrite it, are not looked at.
+
+    ``intern`` when ``True`` makes repeated keys and values share one string object, which
+    cuts the memory held by large trees. Keys are interned with ``sys.intern`` and values
+    through a table that lives for one parse and is capped in size (see ``_interners``).
+
+    ``workers`` when set, parses the document on that many processes. ``fp`` is read whole,
+    a pre-scan splits it into runs of sibling blocks (splitting large blocks further) and those
+    are parsed in parallel, while the tree around them is built here in the original order.
+    Worth it for documents of tens of MB; not compatible with ``select``.
     """
     if not issubclass(mapper, Mapping):
         raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
     if not hasattr(fp, 'readline'):
         raise TypeError("Expected fp to be a file-like object supporting line iteration")
 
+    if engine == 'regex':
+        if select is not None or workers:
+            raise ValueError("select and workers are only supported by the scanner engine")
+        return _parse_regex(fp, mapper, merge_duplicate_keys, escaped, intern)
+    elif engine != 'scanner':
+        raise ValueError("Expected engine to be 'scanner' or 'regex', got %s" % repr(engine))
+
+    if workers:
+        data = fp.read() if hasattr(fp, 'read') else ''.join(fp)
+        return _parse_buffer(data, _fp_name(fp), mapper, merge_duplicate_keys, escaped, select=select,
+                             intern=intern, workers=workers, stop_early=stop_early)
+
+    parser = IncrementalParser(mapper, merge_duplicate_keys, escaped, select, name=_fp_name(fp), intern=intern,
+                               stop_early=stop_early)
+
+    for chunk in _iter_text_chunks(fp):
+        parser.feed(chunk)
+        if parser.done:
+            break
+
+    return parser.close()
+
+def _parse_regex(fp, mapper, merge_duplicate_keys, escaped, intern=False):
     stack = [mapper()]
     expect_bracket = False
-
-    re_keyvalue = re.compile(r'^("(?P<qkey>(?:\\.|[^\\"])*)"|(?P<key>#?[a-z0-9\-\_\\\?$%<>]+))'
-                             r'([ \t]*('
-                             r'"(?P<qval>(?:\\.|[^\\"])*)(?P<vq_end>")?'
-                             r'|(?P<val>(?:(?<!/)/(?!/)|[a-z0-9\-\_\\\?\*\.$<> ])+)'
-                             r'|(?P<sblock>{[ \t]*)(?P<eblock>})?'
-                             r'))?',
-                             flags=re.I)
+    re_keyvalue = _re_keyvalue
+    intern_key, intern_value = _interners(intern)
 
     for lineno, line in enumerate(fp, 1):
         if lineno == 1:
@@ -145,6 +964,8 @@ def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
 
             if escaped:
                 key = _unescape(key)
+            if intern_key is not None:
+                key = intern_key(key)
 
             # we have a key with value in parenthesis, so we make a new dict obj (level deeper)
             if val is None:
@@ -175,7 +996,12 @@ def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
                         raise SyntaxError("vdf.parse: unexpected EOF (open quote for value?)",
                                           (getattr(fp, 'name', '<%s>' % fp.__class__.__name__), lineno, 0, line))
 
-                stack[-1][key] = _unescape(val) if escaped else val
+                if escaped:
+                    val = _unescape(val)
+                if intern_value is not None:
+                    val = intern_value(val)
+
+                stack[-1][key] = val
 
             # exit the loop
             break
@@ -187,13 +1013,264 @@ def parse(fp, mapper=dict, merge_duplicate_keys=True, escaped=True):
     return stack.pop()
 
 
+def iterparse(fp, escaped=True):
+    """
+    Incrementally parse ``fp`` (a ``.readline()``-supporting file-like object containing
+    a VDF) and yield ``(event, key, value, lineno)`` tuples, without building a mapping.
+
+    ``event`` is one of ``start_map`` (``value`` is ``None``), ``value`` or ``end_map``
+    (``key`` and ``value`` are ``None``). Keys are reported as they appear in the source,
+    so duplicates are left to the consumer. ``fp`` is read in chunks as the events are
+    consumed, so memory use does not depend on the size of the document.
+    """
+    if not hasattr(fp, 'readline'):
+        raise TypeError("Expected fp to be a file-like object supporting line iteration")
+
+    tokenizer = _TextTokenizer(_fp_name(fp))
+
+    for chunk in _iter_text_chunks(fp):
+        tokenizer.feed(chunk)
+        for event in _iter_events(tokenizer, tokenizer.tokens(), escaped):
+            yield event
+
+    for event in _iter_events(tokenizer, tokenizer.tokens(final=True), escaped):
+        yield event
+
+def _iter_events(tokenizer, tokens, escaped):
+    lineno_at = tokenizer.lineno_at
+
+    for event, key, val, pos in tokens:
+        if escaped:
+            if key is not None and '\\' in key:
+                key = _unescape(key)
+            if val is not None and '\\' in val:
+                val = _unescape(val)
+
+        yield (event, key, val, lineno_at(pos))
+
+
+def _buffer_encoding(encoding):
+    # the codec for the keys and values, when bytes in ``encoding`` can be tokenized as they are
+    name = codecs.lookup(encoding).name
+
+    if name == 'utf-8-sig':
+        # the BOM is stripped by the tokenizer, not from each key and value
+        return 'utf-8'
+    return encoding if name in ('utf-8', 'ascii') else None
+
+def _split_directives(tokens, directives):
+    # moves #base and #include at the top level from the tokens to ``directives``
+    depth = 0
+
+    for token in tokens:
+        event, key = token[0], token[1]
+
+        if event == 'start_map':
+            depth += 1
+        elif event == 'end_map':
+            depth -= 1
+        elif not depth and key.lower() in ('#base', '#include'):
+            directives.append((key.lower(), token[2]))
+            continue
+
+        yield token
+
+def _parse_buffer(buf, name, mapper=dict, merge_duplicate_keys=True, escaped=True, engine='scanner',
+                  select=None, intern=False, workers=None, encoding='utf-8', directives=None, raw=False,
+                  stop_early=False):
+    # encoding is None for raw, where keys and values are not decoded
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+    if raw:
+        encoding = None
+
+    if engine != 'scanner' and encoding is None:
+        raise ValueError("raw is only supported by the scanner engine")
+    if engine != 'scanner':
+        fp = unicodeIO(buf[:].decode(encoding))
+        return parse(fp, mapper, merge_duplicate_keys, escaped, engine, select, intern, workers, stop_early)
+    if workers:
+        if select is not None:
+            raise ValueError("select and workers can't be used together")
+        return _parse_parallel(buf, name, workers, mapper, merge_duplicate_keys, escaped, intern, encoding)
+
+    root = mapper()
+    tokenizer = _TextTokenizer(name, encoding)
+    tokenizer.feed(buf)
+    tokens = tokenizer.tokens(final=True)
+
+    if directives is not None:
+        tokens = _split_directives(tokens, directives)
+
+    _consumer(tokenizer, root, mapper, merge_duplicate_keys, escaped, select, intern, stop_early)(tokens)
+    return root
+
+_PARALLEL_MIN_RANGE = 65536
+
+def _split_blocks(buf, name, encoding, limit, ops):
+    """
+    Pre-scan for the parallel parse, appends the document in ``buf`` to ``ops`` as operations
+
+    - ``('value', key, value)``
+    - ``('block', key, operations)`` for the top level blocks, and the blocks that are larger
+      than ``limit``, which are split further
+    - ``('range', text)`` for a run of sibling blocks, up to ``limit`` in size, to be parsed
+      on its own
+
+    Keys and values are raw. Blocks are skipped by the tokenizer, without yielding their tokens,
+    unless they turn out to be larger than ``limit``. The text of each range is yielded as soon
+    as it's known, so it can be parsed while the scan goes on.
+    """
+    tokenizer = _TextTokenizer(name, encoding)
+    tokenizer.skip_limit = limit
+    tokenizer.feed(buf)
+
+    stack = [ops]
+    # key and start of the block being skipped, and the [start, end) of the blocks not added yet
+    start = None
+    span = None
+
+    for event, key, val, pos in tokenizer.tokens(final=True):
+        if start is not None:
+            # the skipped block ends where the next statement starts
+            if not tokenizer.skip_rewound and span is not None and span[1] == start and pos - span[0] <= limit:
+                span[1] = pos
+            else:
+                if span is not None:
+                    text = buf[span[0]:span[1]]
+                    stack[-1].append(('range', text))
+                    yield text
+                span = [start, pos]
+
+                if tokenizer.skip_rewound:
+                    # too large, the tokens of the block follow
+                    tokenizer.skip_rewound = False
+                    span = None
+                    children = []
+                    stack[-1].append(('block', skip_key, children))
+                    stack.append(children)
+            start = None
+
+        if event == 'start_map' and len(stack) > 1:
+            tokenizer.skip_block = True
+            skip_key = key
+            start = pos
+            continue
+
+        if span is not None:
+            text = buf[span[0]:span[1]]
+            stack[-1].append(('range', text))
+            yield text
+            span = None
+
+        if event == 'end_map':
+            stack.pop()
+        elif event == 'value':
+            stack[-1].append(('value', key, val))
+        else:
+            children = []
+            stack[-1].append(('block', key, children))
+            stack.append(children)
+
+def _parse_range_worker(job):
+    text, name, mapper, merge_duplicate_keys, escaped, intern, encoding = job
+    result = _parse_buffer(text, name, mapper, merge_duplicate_keys, escaped, intern=intern, encoding=encoding)
+    return pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+
+def _build_blocks(ops, node, results, mapper, merge_duplicate_keys, escaped, interners, encoding):
+    # replays the operations of _split_blocks, the same way _build_tree handles tokens
+    intern_key, intern_value = interners
+    unescape = _unescape if encoding is not None else _unescape_raw
+
+    for op in ops:
+        if op[0] == 'range':
+            result = pickle.loads(next(results))
+
+            # parsed on its own, a key that is already here can merge differently
+            if merge_duplicate_keys and any(key in node for key in result.keys()):
+                tokenizer = _TextTokenizer('<range>', encoding)
+                tokenizer.feed(op[1])
+                _build_tree(tokenizer.tokens(final=True), [node], mapper, merge_duplicate_keys, escaped, interners,
+                            encoding is None)
+            else:
+                for key, value in result.items():
+                    node[key] = value
+            continue
+
+        key = unescape(op[1]) if escaped else op[1]
+        if intern_key is not None:
+            key = intern_key(key)
+
+        if op[0] == 'value':
+            val = unescape(op[2]) if escaped else op[2]
+            node[key] = intern_value(val) if intern_value is not None else val
+            continue
+
+        if merge_duplicate_keys and key in node:
+            _m = node[key]
+            if not isinstance(_m, mapper):
+                _m = node[key] = mapper()
+        else:
+            _m = node[key] = mapper()
+
+        _build_blocks(op[2], _m, results, mapper, merge_duplicate_keys, escaped, interners, encoding)
+
+def _parse_parallel(buf, name, workers, mapper, merge_duplicate_keys, escaped, intern, encoding):
+    """
+    Parse a large document on ``workers`` processes
+
+    The blocks are located with ``_split_blocks`` and the ranges are handed to the workers as
+    they are found, while this process builds the rest of the tree around them in the original order.
+    On a syntax error, the document is parsed again serially, for an accurate error.
+    """
+    def serial():
+        return _parse_buffer(buf, name, mapper, merge_duplicate_keys, escaped, intern=intern, encoding=encoding)
+
+    if len(buf) < 2 * _PARALLEL_MIN_RANGE:
+        return serial()
+
+    limit = max(len(buf) // (workers * 4), _PARALLEL_MIN_RANGE)
+    pool = multiprocessing.Pool(workers)
+
+    try:
+        ops = []
+        pending = [pool.apply_async(_parse_range_worker,
+                                    ((text, name, mapper, merge_duplicate_keys, escaped, intern, encoding),))
+                   for text in _split_blocks(buf, name, encoding, limit, ops)]
+
+        root = mapper()
+        _build_blocks(ops, root, (result.get() for result in pending), mapper, merge_duplicate_keys, escaped,
+                      _interners(intern, encoding is None), encoding)
+        return root
+    except SyntaxError:
+        return serial()
+    finally:
+        pool.terminate()
+        pool.join()
+
 def loads(s, **kwargs):
     """
     Deserialize ``s`` (a ``str`` or ``unicode`` instance containing a JSON
     document) to a Python object.
+
+    ``s`` can also be UTF-8 encoded ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``,
+    which is tokenized as is, without decoding the whole document first. ``raw=True`` then
+    leaves keys and values as ``bytes``, without decoding them either.
+    On Python 2, ``str`` is parsed as text, as it always was, unless ``raw=True``.
     """
+    if isinstance(s, (bytes, bytearray, memoryview, mmap.mmap)) and (not isinstance(s, string_type) or
+                                                                     kwargs.get('raw')):
+        if isinstance(s, memoryview):
+            s = s.tobytes()
+        elif isinstance(s, bytearray) and bytes is str and kwargs.get('raw'):
+            # on Python 2, the keys and values would be sliced from it as bytearray
+            s = bytes(s)
+        return _parse_buffer(s, '<%s>' % s.__class__.__name__, **kwargs)
     if not isinstance(s, string_type):
         raise TypeError("Expected s to be a str, got %s" % type(s))
+    if kwargs.pop('raw', False):
+        raise TypeError("Expected s to be bytes for raw, got %s" % type(s))
 
     try:
         fp = unicodeIO(s)
@@ -211,6 +1288,205 @@ def load(fp, **kwargs):
     return parse(fp, **kwargs)
 
 
+def load_path(path, encoding='utf-8', **kwargs):
+    """
+    Deserialize the VDF file at ``path`` to a Python object.
+
+    UTF-8 (and ASCII) files are memory mapped and tokenized in place, only the keys and
+    values are decoded. Files in other encodings are decoded as they are read.
+    Keyword arguments are the same as for ``parse``.
+    """
+    buffer_encoding = _buffer_encoding(encoding)
+
+    with open(path, 'rb') as fp:
+        if buffer_encoding is None:
+            return parse(codecs.getreader(encoding)(fp), **kwargs)
+
+        try:
+            buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # empty files and pipes can't be mapped
+            buf = fp.read()
+
+        try:
+            return _parse_buffer(buf, path, encoding=buffer_encoding, **kwargs)
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+
+class IncludeResolver(object):
+    """
+    Loads text VDF files and resolves their ``#base`` and ``#include`` directives
+
+    .. code:: python
+
+        resolver = vdf.IncludeResolver()
+        hud = resolver.load('resource/ui/hudlayout.res')
+
+    Directives are recognized at the top level of a file and name another file, relative to
+    the directory of the file they are in. They follow the merge rules of Valve's KeyValues:
+
+    - ``#include`` appends the keys of the included file, as if its text was at the end of
+      the file (later values override earlier ones, see ``merge_duplicate_keys``)
+    - ``#base`` adds the keys of the base file that are missing, recursively into blocks with
+      the same key. Values already in the file win over the base, as do earlier bases.
+
+    Included files can have directives of their own. Resolved trees are cached by path, and
+    reused while the modification time and size of every file that went into them are the same.
+    ``load()`` returns a copy, so the result can be changed freely.
+
+    ``mapper``, ``merge_duplicate_keys``, ``escaped``, ``intern`` and ``encoding`` are the same as for
+    ``load_path``. Paths in directives are used as written, escape sequences are not processed.
+    """
+    def __init__(self, mapper=dict, merge_duplicate_keys=True, escaped=True, intern=False, encoding='utf-8'):
+        if not issubclass(mapper, Mapping):
+            raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+        self.mapper = mapper
+        self.merge_duplicate_keys = merge_duplicate_keys
+        self.escaped = escaped
+        self.intern = intern
+        self.encoding = encoding
+        # path: (tree, [(path, stamp), ...] for every file that went into it)
+        self._cache = {}
+
+    def clear(self):
+        """
+        Drop all cached trees
+        """
+        self._cache.clear()
+
+    def load(self, path):
+        """
+        Deserialize the VDF file at ``path`` with its directives resolved
+        """
+        return self._copy(self._resolve(os.path.abspath(path), ())[0])
+
+    @staticmethod
+    def _stamp(path):
+        st = os.stat(path)
+        return getattr(st, 'st_mtime_ns', st.st_mtime), st.st_size
+
+    def _parse(self, path, directives):
+        with open(path, 'rb') as fp:
+            data = fp.read()
+
+        encoding = _buffer_encoding(self.encoding)
+
+        if encoding is None:
+            data = data.decode(self.encoding)
+
+        return _parse_buffer(data, path, self.mapper, self.merge_duplicate_keys, self.escaped,
+                             intern=self.intern, encoding=encoding, directives=directives)
+
+    def _resolve(self, path, parents):
+        if path in parents:
+            raise ValueError("vdf: circular #base or #include of %s" % repr(path))
+
+        cached = self._cache.get(path)
+
+        if cached is not None and all(self._stamp(dep) == stamp for dep, stamp in cached[1]):
+            return cached
+
+        deps = [(path, self._stamp(path))]
+        directives = []
+        tree = self._parse(path, directives)
+        parents += (path,)
+        bases = []
+
+        for directive, name in directives:
+            target = os.path.join(os.path.dirname(path), name.replace('\\', '/'))
+            other, other_deps = self._resolve(os.path.normpath(target), parents)
+            deps.extend(other_deps)
+
+            if directive == '#include':
+                self._append(tree, other)
+            else:
+                bases.append(other)
+
+        for base in bases:
+            self._merge_base(tree, base)
+
+        cached = self._cache[path] = (tree, deps)
+        return cached
+
+    def _copy(self, node):
+        result = self.mapper()
+
+        for key, value in node.items():
+            result[key] = self._copy(value) if isinstance(value, Mapping) else value
+
+        return result
+
+    def _append(self, node, other):
+        # the same as parse() would do, with the keys of other following
+        for key, value in other.items():
+            if not isinstance(value, Mapping):
+                node[key] = value
+            elif self.merge_duplicate_keys and key in node and isinstance(node[key], self.mapper):
+                self._append(node[key], value)
+            else:
+                node[key] = self._copy(value)
+
+    def _merge_base(self, node, base):
+        for key, value in base.items():
+            if key not in node:
+                node[key] = self._copy(value) if isinstance(value, Mapping) else value
+            elif isinstance(value, Mapping) and isinstance(node[key], Mapping):
+                self._merge_base(node[key], value)
+
+
+def _load_many_worker(job):
+    path, binary, kwargs = job
+
+    try:
+        if binary:
+            with open(path, 'rb') as fp:
+                result = binary_load(fp, **kwargs)
+        else:
+            result = load_path(path, **kwargs)
+    except Exception as exp:
+        result = exp
+
+    # pickled here, so it is done with the best protocol and a result that can't be pickled
+    # becomes an error for its path, rather than for the whole pool
+    try:
+        return path, pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    except Exception as exp:
+        return path, pickle.dumps(exp, pickle.HIGHEST_PROTOCOL)
+
+def load_many(paths, workers=None, binary=False, ordered=True, chunksize=16, **kwargs):
+    """
+    Deserialize many VDF files in parallel, on a pool of ``workers`` processes
+    (the number of CPUs by default).
+
+    Returns an iterator of ``(path, result)`` tuples, in the order of ``paths`` or, when
+    ``ordered`` is ``False``, in the order the files complete. ``result`` is the exception
+    when a file fails to load, the remaining files are still loaded.
+
+    Text files are loaded with ``load_path`` and binary ones (``binary=True``) with
+    ``binary_load``. The keyword arguments are passed on to them, so ``mapper`` has to be
+    importable by the workers. Paths are sent to the workers in batches of ``chunksize``.
+    """
+    if not issubclass(kwargs.get('mapper', dict), Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(kwargs['mapper']))
+
+    return _load_many_gen(paths, workers, binary, ordered, chunksize, kwargs)
+
+def _load_many_gen(paths, workers, binary, ordered, chunksize, kwargs):
+    pool = multiprocessing.Pool(workers)
+
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+
+        for path, data in imap(_load_many_worker, ((path, binary, kwargs) for path in paths), chunksize):
+            yield path, pickle.loads(data)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 def dumps(obj, pretty=False, escaped=True):
     """
     Serialize ``obj`` to a VDF formatted ``str``.
@@ -243,6 +1519,10 @@ def dump(obj, fp, pretty=False, escaped=True):
         fp.write(chunk)
 
 
+def _iter_items(obj):
+    # VDFDict can skip checking for deleted items, as nothing changes it during a dump
+    return obj._iteritems() if isinstance(obj, VDFDict) else obj.items()
+
 def _dump_gen(data, pretty=False, escaped=True, level=0):
     indent = "\t"
     line_indent = ""
@@ -250,7 +1530,7 @@ def _dump_gen(data, pretty=False, escaped=True, level=0):
     if pretty:
         line_indent = indent * level
 
-    for key, value in data.items():
+    for key, value in _iter_items(data):
         if escaped and isinstance(key, string_type):
             key = _escape(key)
 
@@ -295,11 +1575,14 @@ BIN_END         = b'\x08'
 BIN_INT64       = b'\x0A'
 BIN_END_ALT     = b'\x0B'
 
-def binary_loads(b, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=True):
+def binary_loads(b, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=True,
+                 intern=False, key_table=None, select=None, raw=False, stop_early=False):
     """
     Deserialize ``b`` (``bytes`` containing a VDF in "binary form")
     to a Python object.
 
+    ``b`` can also be a ``bytearray``, ``memoryview`` or ``mmap``.
+
     ``mapper`` specifies the Python object used after deserializetion. ``dict` is
     used by default. Alternatively, ``collections.OrderedDict`` can be used if you
     wish to preserve key order. Or any object that acts like a ``dict``.
@@ -307,13 +1590,46 @@ def binary_loads(b, mapper=dict, merge_duplicate_keys=True, alt_format=False, ra
     ``merge_duplicate_keys`` when ``True`` will merge multiple KeyValue lists with the
     same key into one instead of overwriting. You can se this to ``False`` if you are
     using ``VDFDict`` and need to preserve the duplicates.
+
+    ``intern`` when ``True`` makes repeated keys and string values share one object (see ``parse``).
+
+    ``key_table`` is a list of the key strings, when keys are stored as indexes into it
+    (e.g. in ``appinfo.vdf`` version 29).
+
+    ``select`` is a path or list of paths, as for ``parse``. Only the matching subtrees are
+    decoded, everything else is skipped over without decoding keys or values.
+
+    ``stop_early`` when ``True`` stops decoding once every ``select`` path is complete, as for ``parse``.
+    Only the first occurrence of each selected node is used then, and the rest is only scanned
+    for ``raise_on_remaining``.
+
+    ``raw`` when ``True`` leaves keys and string values as ``bytes``, as they are stored, which
+    ``binary_dumps`` writes back unchanged. Wide strings are still decoded, and keys from ``key_table``
+    are as given. The mapper has to take ``bytes`` keys, which ``VDFDict`` doesn't.
     """
-    if not isinstance(b, bytes):
+    if not isinstance(b, (bytes, bytearray, memoryview, mmap.mmap)):
         raise TypeError("Expected s to be bytes, got %s" % type(b))
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+    if isinstance(b, memoryview):
+        b = b.tobytes()
+    elif isinstance(b, bytearray):
+        b = bytes(b)
+
+    if select is not None:
+        result, pos = _binary_select(b, 0, _normalize_paths(select), mapper, merge_duplicate_keys, alt_format,
+                                     intern, key_table, raise_on_remaining, raw, stop_early)
+    else:
+        result, pos = _binary_decode(b, 0, mapper, merge_duplicate_keys, alt_format, intern, key_table, raw)
+
+    if raise_on_remaining and pos < len(b):
+        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (pos - 1))
 
-    return binary_load(BytesIO(b), mapper, merge_duplicate_keys, alt_format, raise_on_remaining)
+    return result
 
-def binary_load(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=False):
+def binary_load(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, raise_on_remaining=False,
+                intern=False, key_table=None, select=None, raw=False, stop_early=False):
     """
     Deserialize ``fp`` (a ``.read()``-supporting file-like object containing
     binary VDF) to a Python object.
@@ -325,171 +1641,1053 @@ def binary_load(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, ra
     ``merge_duplicate_keys`` when ``True`` will merge multiple KeyValue lists with the
     same key into one instead of overwriting. You can se this to ``False`` if you are
     using ``VDFDict`` and need to preserve the duplicates.
+
+    ``intern`` when ``True`` makes repeated keys and string values share one object (see ``parse``).
+
+    ``key_table`` is a list of the key strings, when keys are stored as indexes into it
+    (e.g. in ``appinfo.vdf`` version 29).
+
+    ``select``, ``raw`` and ``stop_early`` are the same as for ``binary_loads``.
+
+    Files are memory mapped, other objects are read to the end. Afterwards ``fp`` is
+    positioned right after the binary VDF.
     """
     if not hasattr(fp, 'read') or not hasattr(fp, 'tell') or not hasattr(fp, 'seek'):
         raise TypeError("Expected fp to be a file-like object with tell()/seek() and read() returning bytes")
     if not issubclass(mapper, Mapping):
         raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
 
-    # helpers
-    int32 = struct.Struct('<i')
-    uint64 = struct.Struct('<Q')
-    int64 = struct.Struct('<q')
-    float32 = struct.Struct('<f')
+    if select is not None:
+        select = _normalize_paths(select)
 
-    def read_string(fp, wide=False):
-        buf, end = b'', -1
-        offset = fp.tell()
+    offset = fp.tell()
+    buf, base = _binary_buffer(fp, offset)
 
-        # locate string end
-        while end == -1:
-            chunk = fp.read(64)
+    try:
+        if select is not None:
+            result, end = _binary_select(buf, offset - base, select, mapper, merge_duplicate_keys, alt_format,
+                                         intern, key_table, raw=raw, stop_early=stop_early)
+        else:
+            result, end = _binary_decode(buf, offset - base, mapper, merge_duplicate_keys, alt_format, intern,
+                                         key_table, raw)
+        remaining = end < len(buf)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
 
-            if chunk == b'':
-                raise SyntaxError("Unterminated cstring (offset: %d)" % offset)
+    fp.seek(base + end)
 
-            buf += chunk
-            end = buf.find(b'\x00\x00' if wide else b'\x00')
+    if raise_on_remaining and remaining:
+        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (base + end - 1))
 
-        if wide:
-            end += end % 2
+    return result
+
+def binary_load_iter(fp, mapper=dict, merge_duplicate_keys=True, alt_format=False, intern=False, key_table=None,
+                     raw=False):
+    """
+    Deserialize consecutive binary VDF documents in ``fp`` (a ``.read()``-supporting file-like object,
+    or ``bytes``, ``bytearray``, ``memoryview`` or ``mmap``), and yield ``(offset, result)`` for each.
 
-        # rewind fp
-        fp.seek(end - len(buf) + (2 if wide else 1), 1)
+    ``offset`` is where the document starts in ``fp``. The other arguments are the same as for ``binary_load``.
 
-        # decode string
-        result = buf[:end]
+    Files are memory mapped and other objects are read to the end once, all documents are decoded from
+    that one buffer. When the iteration stops, ``fp`` is positioned right after the last document that
+    was yielded, when it supports ``seek()``.
+    """
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
 
-        if wide:
-            result = result.decode('utf-16')
-        elif bytes is not str:
-            result = result.decode('utf-8', 'replace')
+    if isinstance(fp, (bytes, bytearray, memoryview, mmap.mmap)):
+        buf = fp
+        pos = base = 0
+        fp = None
+
+        if isinstance(buf, memoryview):
+            buf = buf.tobytes()
+        elif isinstance(buf, bytearray):
+            buf = bytes(buf)
+    elif hasattr(fp, 'read'):
+        pos = fp.tell() if hasattr(fp, 'tell') else 0
+        buf, base = _binary_buffer(fp, pos)
+        pos -= base
+    else:
+        raise TypeError("Expected fp to be bytes or a file-like object, got %s" % type(fp))
+
+    n = len(buf)
+
+    try:
+        while pos < n:
+            result, end = _binary_decode(buf, pos, mapper, merge_duplicate_keys, alt_format, intern, key_table,
+                                         raw)
+            start, pos = pos, end
+            yield base + start, result
+    finally:
+        if fp is not None:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+            if hasattr(fp, 'seek'):
+                fp.seek(base + pos)
+
+def _binary_buffer(fp, offset):
+    """
+    Returns the data of ``fp`` as a buffer, and the offset of the buffer in ``fp``
+
+    That's all of it for files and ``BytesIO``, otherwise the rest is read from ``offset``
+    """
+    if isinstance(fp, BytesIO):
+        return fp.getvalue(), 0
+
+    buf = _binary_mmap(fp)
+
+    if buf is not None:
+        return buf, 0
+
+    return fp.read(), offset
+
+def _binary_mmap(fp):
+    # returns fp memory mapped, or None when it isn't a file that can be mapped
+    if isinstance(getattr(fp, 'raw', fp), file_type):
+        try:
+            return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # empty files and pipes can't be mapped
+            pass
+
+    return None
+
+_BINARY_CHUNK_SIZE = 65536
+
+def binary_iterparse(fp_or_buffer, alt_format=False, key_table=None):
+    """
+    Incrementally parse a binary VDF and yield ``(event, key, value, type, offset)`` tuples,
+    without building a mapping.
+
+    ``fp_or_buffer`` is a ``.read()``-supporting file-like object, or ``bytes``, ``bytearray``,
+    ``memoryview`` or ``mmap``.
+
+    ``event`` is one of ``start_map`` (``value`` is ``None``), ``value`` or ``end_map``
+    (``key`` and ``value`` are ``None``). ``type`` is the ``BIN_*`` type byte of the item, and
+    ``offset`` is where it is in the stream. Values are decoded as ``binary_load`` does,
+    so ``INT_64``, ``UINT_64``, ``POINTER`` and ``COLOR`` values keep their types.
+
+    Files are memory mapped, other streams are read in chunks as the events are consumed.
+    After the last event, ``fp`` is positioned right after the binary VDF, when it supports ``seek()``.
+
+    ``key_table`` is the same as for ``binary_load``.
+    """
+    if isinstance(fp_or_buffer, (bytes, bytearray, memoryview, mmap.mmap)):
+        fp = None
+        buf = fp_or_buffer
+        base = 0
+
+        if isinstance(buf, memoryview):
+            buf = buf.tobytes()
+        elif isinstance(buf, bytearray):
+            buf = bytes(buf)
+    elif hasattr(fp_or_buffer, 'read'):
+        fp = fp_or_buffer
+        base = fp.tell() if hasattr(fp, 'tell') else 0
+
+        if isinstance(fp, BytesIO):
+            buf = fp.getvalue()
         else:
-            try:
-                result.decode('ascii')
-            except:
-                result = result.decode('utf-8', 'replace')
+            buf = _binary_mmap(fp)
+    else:
+        raise TypeError("Expected fp_or_buffer to be bytes or a file-like object, got %s" % type(fp_or_buffer))
 
-        return result
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+    depth = 0
+
+    if buf is None:
+        # read in chunks, buf holds the data from base
+        read = fp.read
+        buf = b''
+        pos = 0
+        final = False
+    else:
+        read = None
+        pos = base if fp is not None else 0
+        base = 0
+        final = True
+
+    n = len(buf)
 
-    stack = [mapper()]
+    try:
+        while True:
+            if pos < n:
+                item = _binary_event(buf, pos, base, CURRENT_BIN_END, key_table, final)
+            else:
+                item = None
+
+            if item is None:
+                if final:
+                    if depth:
+                        raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+                    break
+
+                # drop what was parsed, and read more than the item that was cut off
+                data = read(max(_BINARY_CHUNK_SIZE, n - pos))
+                base += pos
+                buf = buf[pos:] + data
+                pos = 0
+                n = len(buf)
+                final = not data
+                continue
+
+            t, key, val, end = item
+
+            if t == CURRENT_BIN_END:
+                if not depth:
+                    pos = end
+                    break
+                depth -= 1
+                yield ('end_map', None, None, t, base + pos)
+            elif t == BIN_NONE:
+                depth += 1
+                yield ('start_map', key, None, t, base + pos)
+            else:
+                yield ('value', key, val, t, base + pos)
+
+            pos = end
+    finally:
+        if isinstance(buf, mmap.mmap) and buf is not fp_or_buffer:
+            buf.close()
+
+    if fp is not None and hasattr(fp, 'seek'):
+        fp.seek(base + pos)
+
+def _binary_event(buf, pos, base, end_type, key_table, final):
+    """
+    Returns the type, key and value of the item at ``pos``, and the offset after it
+
+    When the item is cut off at the end of ``buf``, returns ``None``, unless ``final`` is set
+    """
+    t = buf[pos:pos + 1]
+
+    if t == end_type:
+        return t, None, None, pos + 1
+
+    numbers = _binary_numbers
+
+    if t != BIN_STRING and t != BIN_NONE and t not in numbers and t != BIN_WIDESTRING:
+        raise SyntaxError("Unknown data type at offset %d: %s" % (base + pos, repr(t)))
+
+    pos += 1
+    n = len(buf)
+
+    if key_table is None:
+        end = buf.find(b'\x00', pos)
+
+        if end == -1:
+            if final:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % (base + pos))
+            return None
+
+        key = _binary_string(buf[pos:end])
+        pos = end + 1
+    else:
+        if pos + 4 > n:
+            if final:
+                raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+            return None
+
+        index = _binary_uint32.unpack_from(buf, pos)[0]
+
+        if index >= len(key_table):
+            raise SyntaxError("Key index %d is not in the key table (offset: %d)" % (index, base + pos))
+
+        key = key_table[index]
+        pos += 4
+
+    if t == BIN_STRING:
+        end = buf.find(b'\x00', pos)
+
+        if end == -1:
+            if final:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % (base + pos))
+            return None
+
+        return t, key, _binary_string(buf[pos:end]), end + 1
+    elif t == BIN_NONE:
+        return t, key, None, pos
+    elif t == BIN_WIDESTRING:
+        end = buf.find(b'\x00\x00', pos)
+
+        if end != -1:
+            end += (end - pos) % 2
+
+        if end == -1 or end + 2 > n:
+            if final:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % (base + pos))
+            return None
+
+        return t, key, buf[pos:end].decode('utf-16'), end + 2
+    else:
+        number, wrap = numbers[t]
+
+        if pos + number.size > n:
+            if final:
+                raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+            return None
+
+        val = number.unpack_from(buf, pos)[0]
+        return t, key, val if wrap is None else wrap(val), pos + number.size
+
+_binary_int32 = struct.Struct('<i')
+_binary_uint32 = struct.Struct('<I')
+_binary_uint64 = struct.Struct('<Q')
+_binary_int64 = struct.Struct('<q')
+_binary_float32 = struct.Struct('<f')
+
+# type -> (struct, type to wrap the value in)
+_binary_numbers = {
+    BIN_INT32: (_binary_int32, None),
+    BIN_POINTER: (_binary_int32, POINTER),
+    BIN_COLOR: (_binary_int32, COLOR),
+    BIN_UINT64: (_binary_uint64, UINT_64),
+    BIN_INT64: (_binary_int64, INT_64),
+    BIN_FLOAT32: (_binary_float32, None),
+}
+
+if bytes is not str:
+    def _binary_string(data):
+        return data.decode('utf-8', 'replace')
+else:
+    def _binary_string(data):
+        try:
+            data.decode('ascii')
+        except:
+            data = data.decode('utf-8', 'replace')
+        return data
+
+def _binary_wide_end(buf, pos):
+    # returns the offset of the terminator of the utf-16 string at pos
+    end = buf.find(b'\x00\x00', pos)
+
+    if end == -1:
+        raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+    return end + (end - pos) % 2
+
+def _binary_wide_string(buf, pos):
+    # returns the utf-16 string at pos, and the offset after it
+    end = _binary_wide_end(buf, pos)
+
+    return buf[pos:end].decode('utf-16'), end + 2
+
+def _binary_decode(buf, pos, mapper, merge_duplicate_keys, alt_format, intern, key_table=None, raw=False):
+    """
+    Decode the binary VDF in ``buf`` (``bytes`` or ``mmap``) starting at ``pos``
+
+    When ``key_table`` is set, keys are ``uint32`` indexes into it, instead of strings.
+    When ``raw`` is set, keys and strings are left as ``bytes``
+
+    Returns the result and the offset right after it
+    """
+    node = mapper()
+    stack = [node]
     CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+    intern_key, intern_value = _interners(intern, raw)
+    numbers = _binary_numbers
+    # bytes() returns slices of bytes as they are
+    decode = _binary_string if not raw else bytes
+    uint32 = _binary_uint32
+    find = buf.find
+    n = len(buf)
+    # VDFDict nodes are appended to, see _build_bulk_tree. builders has one for each node in stack,
+    # None for a value that a block was merged into, where bulk is off and setting items raises.
+    bulk = bulk_mapper = _bulk_mapper(mapper, raw)
+
+    if bulk:
+        append_key, append_value, start = builder = node._builder()
+        builders = [builder]
+
+    while pos < n:
+        t = buf[pos:pos + 1]
+        pos += 1
 
-    for t in iter(lambda: fp.read(1), b''):
         if t == CURRENT_BIN_END:
+            if bulk:
+                node._index(builders.pop()[2])
+            elif bulk_mapper:
+                builders.pop()
             if len(stack) > 1:
                 stack.pop()
+                node = stack[-1]
+                if bulk_mapper:
+                    append_key, append_value, start = builders[-1]
+                    bulk = True
                 continue
             break
 
-        key = read_string(fp)
+        if t != BIN_STRING and t != BIN_NONE and t not in numbers and t != BIN_WIDESTRING:
+            raise SyntaxError("Unknown data type at offset %d: %s" % (pos - 1, repr(t)))
 
-        if t == BIN_NONE:
-            if merge_duplicate_keys and key in stack[-1]:
-                _m = stack[-1][key]
+        if key_table is None:
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            key = decode(buf[pos:end])
+            pos = end + 1
+        else:
+            index = uint32.unpack_from(buf, pos)[0]
+
+            if index >= len(key_table):
+                raise SyntaxError("Key index %d is not in the key table (offset: %d)" % (index, pos))
+
+            key = key_table[index]
+            pos += 4
+
+        if intern_key is not None:
+            key = intern_key(key)
+
+        if t == BIN_STRING:
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            val = decode(buf[pos:end])
+            pos = end + 1
+
+            if intern_value is not None:
+                val = intern_value(val)
+        elif t == BIN_NONE:
+            if bulk:
+                if merge_duplicate_keys:
+                    builders[-1] = (append_key, append_value, node._index(start))
+
+                if merge_duplicate_keys and key in node:
+                    node = node[key]
+                else:
+                    append_key(key)
+                    node = mapper()
+                    append_value(node)
+
+                if isinstance(node, mapper):
+                    append_key, append_value, start = builder = node._builder()
+                else:
+                    builder = None
+                    bulk = False
+                builders.append(builder)
+            elif merge_duplicate_keys and key in node:
+                node = node[key]
             else:
-                _m = mapper()
-                stack[-1][key] = _m
-            stack.append(_m)
-        elif t == BIN_STRING:
-            stack[-1][key] = read_string(fp)
+                node[key] = node = mapper()
+            stack.append(node)
+            continue
         elif t == BIN_WIDESTRING:
-            stack[-1][key] = read_string(fp, wide=True)
-        elif t in (BIN_INT32, BIN_POINTER, BIN_COLOR):
-            val = int32.unpack(fp.read(int32.size))[0]
+            val, pos = _binary_wide_string(buf, pos)
 
-            if t == BIN_POINTER:
-                val = POINTER(val)
-            elif t == BIN_COLOR:
-                val = COLOR(val)
+            if intern_value is not None:
+                val = intern_value(val)
+        else:
+            number, wrap = numbers[t]
+            val = number.unpack_from(buf, pos)[0]
+            pos += number.size
 
-            stack[-1][key] = val
-        elif t == BIN_UINT64:
-            stack[-1][key] = UINT_64(uint64.unpack(fp.read(int64.size))[0])
-        elif t == BIN_INT64:
-            stack[-1][key] = INT_64(int64.unpack(fp.read(int64.size))[0])
-        elif t == BIN_FLOAT32:
-            stack[-1][key] = float32.unpack(fp.read(float32.size))[0]
+            if wrap is not None:
+                val = wrap(val)
+
+        if bulk:
+            append_key(key)
+            append_value(val)
         else:
-            raise SyntaxError("Unknown data type at offset %d: %s" % (fp.tell() - 1, repr(t)))
+            node[key] = val
+
+    if bulk and builders:
+        # reached EOF without BIN_END
+        node._index(builders.pop()[2])
 
     if len(stack) != 1:
         raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
-    if raise_on_remaining and fp.read(1) != b'':
-        fp.seek(-1, 1)
-        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (fp.tell() - 1))
 
-    return stack.pop()
+    return node, pos
 
-def binary_dumps(obj, alt_format=False):
+if bytes is not str:
+    def _binary_key(key):
+        return key.encode('utf-8')
+else:
+    def _binary_key(key):
+        return key.encode('utf-8') if isinstance(key, unicode) else key
+
+def _binary_select(buf, pos, paths, mapper, merge_duplicate_keys, alt_format, intern, key_table=None,
+                   find_end=True, raw=False, stop_early=False):
+    """
+    Decode the parts of the binary VDF in ``buf`` starting at ``pos``, which match ``paths``
+
+    Paths are matched and completed as in ``_PathSelection``. Keys that can't match are
+    compared as bytes, and their values are skipped without being decoded.
+
+    Returns the result and the offset right after it. With ``stop_early``, once every path is
+    complete, the rest is skipped when ``find_end`` is set, otherwise the offset is where decoding stopped.
+    """
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+    intern_key, intern_value = _interners(intern, raw)
+    numbers = _binary_numbers
+    # bytes() returns slices of bytes as they are
+    decode = _binary_string if not raw else bytes
+    uint32 = _binary_uint32
+    find = buf.find
+    n = len(buf)
+
+    # keys are matched as they are stored, None matches any key
+    if key_table is None:
+        keys = [tuple(None if key == '*' else _binary_key(key) for key in path) for path in paths]
+    else:
+        keys = [tuple(None if key == '*' else key for key in path) for path in paths]
+
+    literal = [path.index('*') if '*' in path else len(path) for path in paths]
+    pending = set(range(len(paths)))
+    matchers = {}
+
+    def matcher(active, depth):
+        # maps a child key to the paths it matches and whether one of them ends there
+        try:
+            return matchers[active, depth]
+        except KeyError:
+            pass
+
+        def match(key):
+            matched = tuple(p for p in active if keys[p][depth] is None or keys[p][depth] == key)
+            return matched, any(len(keys[p]) == depth + 1 for p in matched)
+
+        table = dict((keys[p][depth], match(keys[p][depth])) for p in active if keys[p][depth] is not None)
+        m = matchers[active, depth] = (table, match(None), active)
+        return m
+
+    def complete(matched, depth):
+        for p in matched:
+            if literal[p] >= depth:
+                pending.discard(p)
+        return stop_early and not pending
+
+    def child(node, key):
+        if merge_duplicate_keys and key in node:
+            _m = node[key]
+            if isinstance(_m, mapper):
+                return _m
+
+        _m = node[key] = mapper()
+        return _m
+
+    def get_node(frame):
+        if frame[0] is None:
+            frame[0] = child(get_node(frame[2]), frame[1])
+        return frame[0]
+
+    def built(frame):
+        # see _PathSelection._built()
+        if frame[0] is None and merge_duplicate_keys:
+            node = built(frame[2])
+            _m = node.get(frame[1]) if node is not None else None
+            if isinstance(_m, mapper):
+                frame[0] = _m
+        return frame[0]
+
+    def replaced(node, key):
+        # see _PathSelection._replaced()
+        if node is not None and key in node and not isinstance(node, VDFDict):
+            del node[key]
+
+    root = mapper()
+    # frame: [node or None until something matches, key, parent frame, matcher]
+    frames = [[root, None, None, matcher(tuple(range(len(paths))), 0)]]
+    capture = []
+    capture_paths = ()
+
+    while pos < n:
+        t = buf[pos:pos + 1]
+        pos += 1
+
+        if t == CURRENT_BIN_END:
+            if capture:
+                capture.pop()
+                if capture or not complete(capture_paths, len(frames)):
+                    continue
+            elif len(frames) > 1:
+                frame = frames.pop()
+                if not complete(frame[3][2], len(frames)):
+                    continue
+            else:
+                break
+        else:
+            if t != BIN_STRING and t != BIN_NONE and t not in numbers and t != BIN_WIDESTRING:
+                raise SyntaxError("Unknown data type at offset %d: %s" % (pos - 1, repr(t)))
+
+            if key_table is None:
+                end = find(b'\x00', pos)
+
+                if end == -1:
+                    raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+                key = buf[pos:end]
+                pos = end + 1
+            else:
+                index = uint32.unpack_from(buf, pos)[0]
+
+                if index >= len(key_table):
+                    raise SyntaxError("Key index %d is not in the key table (offset: %d)" % (index, pos))
+
+                key = key_table[index]
+                pos += 4
+
+            if capture:
+                matched = selected = True
+            else:
+                frame = frames[-1]
+                table, wild, _ = frame[3]
+                matched, selected = table.get(key, wild)
+
+            if not selected and (not matched or t != BIN_NONE):
+                if matched:
+                    replaced(built(frame), decode(key) if key_table is None else key)
+
+                # skip the value
+                if t == BIN_STRING:
+                    end = find(b'\x00', pos)
+
+                    if end == -1:
+                        raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+                    pos = end + 1
+                elif t == BIN_NONE:
+                    pos = _binary_skip(buf, pos, alt_format, indexed=key_table is not None)
+                elif t == BIN_WIDESTRING:
+                    pos = _binary_wide_end(buf, pos) + 2
+                else:
+                    pos += numbers[t][0].size
+                continue
+
+            if key_table is None:
+                key = decode(key)
+            if intern_key is not None:
+                key = intern_key(key)
+
+            if t == BIN_NONE:
+                if capture:
+                    capture.append(child(capture[-1], key))
+                elif selected:
+                    capture.append(child(get_node(frame), key))
+                    capture_paths = matched
+                else:
+                    if not merge_duplicate_keys:
+                        replaced(frame[0], key)
+                    frames.append([None, key, frame, matcher(matched, len(frames))])
+                continue
+
+            if t == BIN_STRING:
+                end = find(b'\x00', pos)
+
+                if end == -1:
+                    raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+                val = decode(buf[pos:end])
+                pos = end + 1
+
+                if intern_value is not None:
+                    val = intern_value(val)
+            elif t == BIN_WIDESTRING:
+                val, pos = _binary_wide_string(buf, pos)
+
+                if intern_value is not None:
+                    val = intern_value(val)
+            else:
+                number, wrap = numbers[t]
+                val = number.unpack_from(buf, pos)[0]
+                pos += number.size
+
+                if wrap is not None:
+                    val = wrap(val)
+
+            if capture:
+                capture[-1][key] = val
+                continue
+
+            get_node(frame)[key] = val
+
+            if not complete(matched, len(frames)):
+                continue
+
+        # every path is complete
+        if not find_end:
+            return root, pos
+
+        indexed = key_table is not None
+
+        for _ in range(len(frames) - 1):
+            pos = _binary_skip(buf, pos, alt_format, indexed=indexed)
+
+        return root, _binary_skip(buf, pos, alt_format, top=True, indexed=indexed)
+
+    if len(frames) != 1 or capture or pos > n:
+        raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+
+    return root, pos
+
+def _binary_skip_pattern(end, indexed=False, depth=4):
+    # a run of items with string or number values, and blocks of those nested up to depth
+    key = b'.{4}' if indexed else b'[^\x00]*\x00'
+    items = (b'\x01' + key + b'[^\x00]*\x00'
+             b'|[\x02\x03\x04\x06]' + key + b'.{4}'
+             b'|[\x07\x0a]' + key + b'.{8}')
+
+    for _ in range(depth):
+        items += b'|\x00' + key + b'(?:' + items + b')*' + re.escape(end)
+
+    return re.compile(b'(?:' + items + b')*', re.S).match
+
+# (end type, keys are key table indexes) -> match
+_binary_skip_items = dict(((end, indexed), _binary_skip_pattern(end, indexed))
+                          for end in (BIN_END, BIN_END_ALT) for indexed in (False, True))
+
+def _binary_skip(buf, pos, alt_format, top=False, indexed=False):
+    """
+    Returns the offset after the end of the block, which has its first item at ``pos``
+
+    Only the type bytes are looked at, keys and values are skipped without being decoded.
+    When ``top`` is set, the block is the top level, which may also end at EOF.
+    When ``indexed`` is set, keys are indexes into a key table
+    """
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+    numbers = _binary_numbers
+    skip_items = _binary_skip_items[CURRENT_BIN_END, indexed]
+    find = buf.find
+    depth = 1
+
+    while True:
+        pos = skip_items(buf, pos).end()
+        t = buf[pos:pos + 1]
+        pos += 1
+
+        if t == CURRENT_BIN_END:
+            depth -= 1
+            if depth == 0:
+                return pos
+            continue
+
+        if t != BIN_STRING and t != BIN_NONE and t not in numbers and t != BIN_WIDESTRING:
+            if not t:
+                if top and depth == 1 and pos - 1 == len(buf):
+                    return pos - 1
+                raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+            raise SyntaxError("Unknown data type at offset %d: %s" % (pos - 1, repr(t)))
+
+        if indexed:
+            pos += 4
+        else:
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            pos = end + 1
+
+        if t == BIN_STRING:
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            pos = end + 1
+        elif t == BIN_NONE:
+            depth += 1
+        elif t == BIN_WIDESTRING:
+            pos = _binary_wide_end(buf, pos) + 2
+        else:
+            pos += numbers[t][0].size
+
+        if top and pos > len(buf):
+            # the next match would start at the end of buf instead
+            raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+
+
+class LazyBinaryVDF(Mapping):
+    """
+    Read-only ``Mapping`` over a binary VDF, that decodes it one level at a time
+
+    .. code:: python
+
+        data = vdf.LazyBinaryVDF(buf)
+        name = data['appinfo']['common']['name']
+
+    ``buf`` is ``bytes`` or ``mmap`` (a ``bytearray`` or ``memoryview`` is copied to ``bytes``).
+    The keys of a level are decoded when it's first accessed, values only when they are read.
+    Nested blocks are ``LazyBinaryVDF`` as well, and the ones that are not accessed are only
+    scanned over. Blocks with the same key are merged, like ``binary_loads`` does by default.
+
+    Errors in the data are raised when the level that has them, or one of its parents, is accessed.
+    ``binary_dump`` copies nested blocks as they are in ``buf``, without encoding them again.
+    """
+    def __init__(self, buf, alt_format=False):
+        if isinstance(buf, memoryview):
+            buf = buf.tobytes()
+        elif isinstance(buf, bytearray):
+            buf = bytes(buf)
+        elif not isinstance(buf, (bytes, mmap.mmap)):
+            raise TypeError("Expected buf to be bytes, got %s" % type(buf))
+
+        self._buf = buf
+        self._alt_format = alt_format
+        # [start, end) of the items of the block, end is None at the top level
+        self._ranges = [(0, None)]
+        self._index = None
+        self._values = {}
+
+    def _block(self, ranges):
+        block = self.__class__.__new__(self.__class__)
+        block._buf = self._buf
+        block._alt_format = self._alt_format
+        block._ranges = ranges
+        block._index = None
+        block._values = {}
+        return block
+
+    def _indexed(self):
+        # key -> (type, offset of the value), or (BIN_NONE, ranges) for blocks
+        if self._index is None:
+            index = {}
+
+            for start, end in self._ranges:
+                self._scan(index, start, end is None)
+
+            self._index = index
+
+        return self._index
+
+    def _scan(self, index, pos, top):
+        buf = self._buf
+        CURRENT_BIN_END = BIN_END if not self._alt_format else BIN_END_ALT
+        numbers = _binary_numbers
+        find = buf.find
+        n = len(buf)
+
+        while pos < n:
+            t = buf[pos:pos + 1]
+            pos += 1
+
+            if t == CURRENT_BIN_END:
+                return
+
+            if t != BIN_STRING and t != BIN_NONE and t not in numbers and t != BIN_WIDESTRING:
+                raise SyntaxError("Unknown data type at offset %d: %s" % (pos - 1, repr(t)))
+
+            end = find(b'\x00', pos)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+            key = _binary_string(buf[pos:end])
+            pos = end + 1
+
+            if t == BIN_NONE:
+                end = _binary_skip(buf, pos, self._alt_format)
+                entry = index.get(key)
+
+                if entry is not None and entry[0] == BIN_NONE:
+                    entry[1].append((pos, end))
+                else:
+                    index[key] = (t, [(pos, end)])
+            else:
+                index[key] = (t, pos)
+
+                if t == BIN_STRING:
+                    end = find(b'\x00', pos)
+
+                    if end == -1:
+                        raise SyntaxError("Unterminated cstring (offset: %d)" % pos)
+
+                    end += 1
+                elif t == BIN_WIDESTRING:
+                    end = _binary_wide_end(buf, pos) + 2
+                else:
+                    end = pos + numbers[t][0].size
+
+            pos = end
+
+        if not top:
+            raise SyntaxError("Reached EOF, but Binary VDF is incomplete")
+
+    def _raw(self, alt_format):
+        # the encoded items of a nested block, when they can be copied as they are
+        if alt_format == self._alt_format and len(self._ranges) == 1 and self._ranges[0][1] is not None:
+            start, end = self._ranges[0]
+            return self._buf[start:end]
+        return None
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        t, pos = self._indexed()[key]
+
+        if t == BIN_NONE:
+            value = self._block(pos)
+        elif t == BIN_STRING:
+            value = _binary_string(self._buf[pos:self._buf.find(b'\x00', pos)])
+        elif t == BIN_WIDESTRING:
+            value = _binary_wide_string(self._buf, pos)[0]
+        else:
+            number, wrap = _binary_numbers[t]
+            value = number.unpack_from(self._buf, pos)[0]
+            if wrap is not None:
+                value = wrap(value)
+
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self._indexed()
+
+    def __iter__(self):
+        return iter(self._indexed())
+
+    def __len__(self):
+        return len(self._indexed())
+
+def binary_dumps(obj, alt_format=False, key_table=None):
     """
     Serialize ``obj`` to a binary VDF formatted ``bytes``.
+
+    ``key_table`` when set to a list, keys are written as indexes into it, instead of strings.
+    Keys that are not in it yet are appended to it.
+
+    ``bytes`` keys and values are written as they are, such as those from ``binary_loads(raw=True)``.
     """
-    buf = BytesIO()
-    binary_dump(obj, buf, alt_format)
-    return buf.getvalue()
+    if not isinstance(obj, Mapping):
+        raise TypeError("Expected obj to be type of Mapping")
+    if key_table is not None and not isinstance(key_table, list):
+        raise TypeError("Expected key_table to be a list, got %s" % type(key_table))
 
-def binary_dump(obj, fp, alt_format=False):
+    return bytes(_binary_encode(obj, alt_format, key_table))
+
+def binary_dump(obj, fp, alt_format=False, key_table=None):
     """
     Serialize ``obj`` to a binary VDF formatted ``bytes`` and write it to ``fp`` filelike object
+
+    ``key_table`` is the same as for ``binary_dumps``.
     """
     if not isinstance(obj, Mapping):
         raise TypeError("Expected obj to be type of Mapping")
     if not hasattr(fp, 'write'):
         raise TypeError("Expected fp to have write() method")
+    if key_table is not None and not isinstance(key_table, list):
+        raise TypeError("Expected key_table to be a list, got %s" % type(key_table))
 
-    for chunk in _binary_dump_gen(obj, alt_format=alt_format):
-        fp.write(chunk)
+    fp.write(_binary_encode(obj, alt_format, key_table))
 
-def _binary_dump_gen(obj, level=0, alt_format=False):
-    if level == 0 and len(obj) == 0:
-        return
+def _binary_encode(obj, alt_format=False, key_table=None, header=0):
+    """
+    Returns ``obj`` encoded as binary VDF in a ``bytearray``, after ``header`` bytes left for the caller
 
-    int32 = struct.Struct('<i')
-    uint64 = struct.Struct('<Q')
-    int64 = struct.Struct('<q')
-    float32 = struct.Struct('<f')
+    The first pass checks the types, encodes keys and strings, and adds up the size.
+    The second one fills a buffer of that size.
+    """
+    if len(obj) == 0:
+        return bytearray(header)
 
-    for key, value in obj.items():
-        if isinstance(key, string_type):
-            key = key.encode('utf-8')
-        else:
-            raise TypeError("dict keys must be of type str, got %s" % type(key))
+    # key -> encoded key, each key is only encoded once
+    keys = {}
 
-        if isinstance(value, Mapping):
-            yield BIN_NONE + key + BIN_NONE
-            for chunk in _binary_dump_gen(value, level+1, alt_format=alt_format):
-                yield chunk
-        elif isinstance(value, UINT_64):
-            yield BIN_UINT64 + key + BIN_NONE + uint64.pack(value)
-        elif isinstance(value, INT_64):
-            yield BIN_INT64 + key + BIN_NONE + int64.pack(value)
-        elif isinstance(value, string_type):
+    if key_table is not None:
+        for index, key in enumerate(key_table):
+            keys.setdefault(key, _binary_uint32.pack(index))
+
+    CURRENT_BIN_END = BIN_END if not alt_format else BIN_END_ALT
+    int32 = _binary_int32
+    uint64 = _binary_uint64
+    int64 = _binary_int64
+    float32 = _binary_float32
+
+    # (bytes, struct or None, number), in the order they are written
+    chunks = []
+    append = chunks.append
+    size = header
+    stack = [iter(_iter_items(obj))]
+
+    while stack:
+        for key, value in stack[-1]:
             try:
-                value = value.encode('utf-8') + BIN_NONE
-                yield BIN_STRING
-            except:
-                value = value.encode('utf-16') + BIN_NONE*2
-                yield BIN_WIDESTRING
-            yield key + BIN_NONE + value
-        elif isinstance(value, float):
-            yield BIN_FLOAT32 + key + BIN_NONE + float32.pack(value)
-        elif isinstance(value, (COLOR, POINTER, int, int_type)):
-            if isinstance(value, COLOR):
-                yield BIN_COLOR
-            elif isinstance(value, POINTER):
-                yield BIN_POINTER
+                key = keys[key]
+            except (KeyError, TypeError):
+                if not isinstance(key, (string_type, bytes)):
+                    raise TypeError("dict keys must be of type str, got %s" % type(key))
+
+                if key_table is None:
+                    keys[key] = (key if isinstance(key, bytes) else key.encode('utf-8')) + BIN_NONE
+                else:
+                    keys[key] = _binary_uint32.pack(len(key_table))
+                    key_table.append(key)
+
+                key = keys[key]
+
+            if isinstance(value, bytes):
+                # written as they are, e.g. values from binary_loads(raw=True)
+                data = BIN_STRING + key + value + BIN_NONE
+                append((data, None, None))
+                size += len(data)
+            elif isinstance(value, string_type):
+                try:
+                    data = BIN_STRING + key + value.encode('utf-8') + BIN_NONE
+                except:
+                    data = BIN_WIDESTRING + key + value.encode('utf-16') + BIN_NONE*2
+                append((data, None, None))
+                size += len(data)
+            elif isinstance(value, Mapping):
+                raw = value._raw(alt_format) if isinstance(value, LazyBinaryVDF) and key_table is None else None
+
+                if raw is not None:
+                    data = BIN_NONE + key + raw
+                    append((data, None, None))
+                    size += len(data)
+                else:
+                    append((BIN_NONE + key, None, None))
+                    size += 1 + len(key)
+                    stack.append(iter(_iter_items(value)))
+                    break
             else:
-                yield BIN_INT32
-            yield key + BIN_NONE
-            yield int32.pack(value)
+                if isinstance(value, UINT_64):
+                    t, number = BIN_UINT64, uint64
+                elif isinstance(value, INT_64):
+                    t, number = BIN_INT64, int64
+                elif isinstance(value, float):
+                    t, number = BIN_FLOAT32, float32
+                elif isinstance(value, COLOR):
+                    t, number = BIN_COLOR, int32
+                elif isinstance(value, POINTER):
+                    t, number = BIN_POINTER, int32
+                elif isinstance(value, (int, int_type)):
+                    t, number = BIN_INT32, int32
+                else:
+                    raise TypeError("Unsupported type: %s" % type(value))
+
+                append((t + key, number, value))
+                size += 1 + len(key) + number.size
         else:
-            raise TypeError("Unsupported type: %s" % type(value))
+            stack.pop()
+            append((CURRENT_BIN_END, None, None))
+            size += 1
+
+    buf = bytearray(size)
+    pos = header
 
-    yield BIN_END if not alt_format else BIN_END_ALT
+    for data, number, value in chunks:
+        end = pos + len(data)
+        buf[pos:end] = data
+        pos = end
 
+        if number is not None:
+            number.pack_into(buf, pos, value)
+            pos += number.size
 
-def vbkv_loads(s, mapper=dict, merge_duplicate_keys=True):
+    return buf
+
+
+def vbkv_loads(s, mapper=dict, merge_duplicate_keys=True, verify_only=False):
     """
     Deserialize ``s`` (``bytes`` containing a VBKV to a Python object.
 
@@ -500,22 +2698,121 @@ def vbkv_loads(s, mapper=dict, merge_duplicate_keys=True):
     ``merge_duplicate_keys`` when ``True`` will merge multiple KeyValue lists with the
     same key into one instead of overwriting. You can se this to ``False`` if you are
     using ``VDFDict`` and need to preserve the duplicates.
+
+    ``verify_only`` when ``True`` only checks the header and checksum, without decoding,
+    and returns ``None``.
     """
-    if s[:4] != b'VBKV':
+    if isinstance(s, memoryview):
+        s = s.tobytes()
+    elif isinstance(s, bytearray):
+        s = bytes(s)
+
+    if s[:4] != b'VBKV' or len(s) < 8:
         raise ValueError("Invalid header")
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
 
-    checksum, = struct.unpack('<i', s[4:8])
+    checksum, = _vbkv_checksum.unpack_from(s, 4)
 
-    if checksum != crc32(s[8:]):
+    # slices of a memoryview are not copies
+    if checksum != _vbkv_crc32(memoryview(s) if isinstance(s, bytes) else s, 8):
         raise ValueError("Invalid checksum")
 
-    return binary_loads(s[8:], mapper, merge_duplicate_keys, alt_format=True)
+    if verify_only:
+        return None
+
+    result, end = _binary_decode(s, 8, mapper, merge_duplicate_keys, True, False)
+
+    if end < len(s):
+        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (end - 1))
+
+    return result
+
+def vbkv_load(fp, mapper=dict, merge_duplicate_keys=True, verify_only=False):
+    """
+    Deserialize ``fp`` (a ``.read()``-supporting file-like object containing
+    a VBKV) to a Python object. The VBKV is the rest of ``fp``.
+
+    Files are memory mapped, and the checksum is computed a chunk at a time.
+    With ``verify_only``, ``fp`` is only read a chunk at a time, and doesn't need ``seek()``.
+
+    ``mapper``, ``merge_duplicate_keys`` and ``verify_only`` are the same as for ``vbkv_loads``.
+    """
+    if not hasattr(fp, 'read'):
+        raise TypeError("Expected fp to be a file-like object with read() returning bytes")
+    if not issubclass(mapper, Mapping):
+        raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+    header = fp.read(8)
+
+    if header[:4] != b'VBKV' or len(header) < 8:
+        raise ValueError("Invalid header")
+
+    checksum, = _vbkv_checksum.unpack_from(header, 4)
+
+    if verify_only:
+        crc = 0
+
+        for chunk in iter(lambda: fp.read(_VBKV_CHUNK_SIZE), b''):
+            crc = crc32(chunk, crc)
+
+        if checksum != crc & 0xffffffff:
+            raise ValueError("Invalid checksum")
+
+        return None
+
+    offset = fp.tell()
+    buf, base = _binary_buffer(fp, offset)
+
+    try:
+        if checksum != _vbkv_crc32(buf, offset - base):
+            raise ValueError("Invalid checksum")
+
+        result, end = _binary_decode(buf, offset - base, mapper, merge_duplicate_keys, True, False)
+        remaining = end < len(buf)
+    finally:
+        if isinstance(buf, mmap.mmap):
+            buf.close()
+
+    fp.seek(base + end)
+
+    if remaining:
+        raise SyntaxError("Binary VDF ended at offset %d, but there is more data remaining" % (base + end - 1))
+
+    return result
+
+_vbkv_checksum = struct.Struct('<I')
+_VBKV_CHUNK_SIZE = 1024 * 1024
+
+def _vbkv_crc32(buf, start):
+    # crc32 of buf[start:], a chunk at a time, so a large buffer is not copied whole
+    crc = 0
+
+    for offset in range(start, len(buf), _VBKV_CHUNK_SIZE):
+        crc = crc32(buf[offset:offset + _VBKV_CHUNK_SIZE], crc)
+
+    return crc & 0xffffffff
 
 def vbkv_dumps(obj):
     """
     Serialize ``obj`` to a VBKV formatted ``bytes``.
     """
-    data =  b''.join(_binary_dump_gen(obj, alt_format=True))
-    checksum = crc32(data)
+    return bytes(_vbkv_encode(obj))
+
+def vbkv_dump(obj, fp):
+    """
+    Serialize ``obj`` to a VBKV formatted ``bytes`` and write it to ``fp`` filelike object
+    """
+    if not isinstance(obj, Mapping):
+        raise TypeError("Expected obj to be type of Mapping")
+    if not hasattr(fp, 'write'):
+        raise TypeError("Expected fp to have write() method")
+
+    fp.write(_vbkv_encode(obj))
+
+def _vbkv_encode(obj):
+    buf = _binary_encode(obj, alt_format=True, header=8)
+    buf[0:4] = b'VBKV'
+    _vbkv_checksum.pack_into(buf, 4, crc32(memoryview(buf)[8:]) & 0xffffffff)
 
-    return b'VBKV' + struct.pack('<i', checksum) + data
+    return buf
@@ -0,0 +1,261 @@
+"""
+Readers for Steam's ``appinfo.vdf`` and ``packageinfo.vdf``, which hold a binary VDF per app or package
+"""
+import os
+import mmap
+import struct
+
+import vdf
+
+# magic -> (name of the id field, version)
+APPINFO_MAGICS = {
+    0x07564427: ('appid', 27),
+    0x07564428: ('appid', 28),
+    0x07564429: ('appid', 29),
+    0x06565527: ('packageid', 39),
+    0x06565528: ('packageid', 40),
+}
+
+_header = struct.Struct('<II')
+_key_table_offset = struct.Struct('<q')
+_uint32 = struct.Struct('<I')
+_appinfo_record = struct.Struct('<IIIIQ20sI')
+_appinfo_binary_sha1 = struct.Struct('<20s')
+_packageinfo_record = struct.Struct('<I20sI')
+_packageinfo_token = struct.Struct('<Q')
+
+_index_header = struct.Struct('<8sQQI')
+_index_entry = struct.Struct('<IQ')
+_INDEX_MAGIC = b'VDFINDEX'
+
+
+class AppInfo(object):
+    """
+    Reader for ``appinfo.vdf`` and ``packageinfo.vdf``, with random access by id
+
+    .. code:: python
+
+        with vdf.AppInfo('appcache/appinfo.vdf') as appinfo:
+            common = appinfo[440]['appinfo']['common']
+
+            for appid, data in appinfo.items():
+                pass
+
+    The file is memory mapped. Opening it only reads the record headers, to build an index
+    of the app (or package) ids, and records are decoded with ``binary_loads`` when accessed.
+    From version 29, keys are stored in a table at the end of the file, which is ``key_table``.
+
+    ``index_path`` is where the index is saved, to be reused while the size and modification
+    time of the file are the same. By default it's not saved.
+
+    ``mapper``, ``merge_duplicate_keys``, ``intern``, ``select`` and ``stop_early`` are the same as for ``binary_load``.
+    With ``select``, only the matching parts of each record are decoded
+    (e.g. ``select=[['appinfo', 'common', 'name'], ['appinfo', 'common', 'type']]``).
+    """
+    def __init__(self, path, mapper=dict, merge_duplicate_keys=True, intern=False, index_path=None, select=None,
+                 stop_early=False):
+        if not issubclass(mapper, vdf.Mapping):
+            raise TypeError("Expected mapper to be subclass of dict, got %s" % type(mapper))
+
+        self.path = path
+        self.mapper = mapper
+        self.merge_duplicate_keys = merge_duplicate_keys
+        self.intern = intern
+        self.index_path = index_path
+        self.select = vdf._normalize_paths(select) if select is not None else None
+        self.stop_early = stop_early
+
+        with open(path, 'rb') as fp:
+            try:
+                self._buf = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, EnvironmentError):
+                # empty files and pipes can't be mapped
+                self._buf = fp.read()
+
+        try:
+            if len(self._buf) < _header.size:
+                raise ValueError("Invalid header")
+
+            self.magic, self.universe = _header.unpack_from(self._buf, 0)
+
+            if self.magic not in APPINFO_MAGICS:
+                raise ValueError("Unsupported magic: 0x%08x" % self.magic)
+
+            self.id_field, self.version = APPINFO_MAGICS[self.magic]
+            self._start = _header.size
+            self.key_table = None
+
+            if self.id_field == 'appid' and self.version >= 29:
+                offset, = _key_table_offset.unpack_from(self._buf, self._start)
+                self._start += _key_table_offset.size
+                self.key_table = self._read_key_table(offset)
+
+            self._ids, self._offsets = self._load_index()
+        except:
+            self.close()
+            raise
+
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, id):
+        return id in self._offsets
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __getitem__(self, id):
+        return self._decode(self._offsets[id])
+
+    def get(self, id, default=None):
+        """ Returns the decoded data of ``id``, or ``default`` if it's not in the file """
+        if id not in self._offsets:
+            return default
+        return self[id]
+
+    def header(self, id):
+        """ Returns the fields of the record header of ``id`` as a ``dict`` """
+        return self._record(self._offsets[id])[0]
+
+    def items(self):
+        """ Yields ``(id, data)`` for every record, in the order of the file """
+        for id in self._ids:
+            yield id, self[id]
+
+    def _record(self, offset):
+        # returns the header of the record at offset, and the offset of its data
+        buf = self._buf
+
+        if self.id_field == 'appid':
+            fields = _appinfo_record.unpack_from(buf, offset)
+            header = dict(zip(('appid', 'size', 'info_state', 'last_updated', 'access_token', 'sha1',
+                               'change_number'), fields))
+            offset += _appinfo_record.size
+
+            if self.version >= 28:
+                header['binary_sha1'], = _appinfo_binary_sha1.unpack_from(buf, offset)
+                offset += _appinfo_binary_sha1.size
+        else:
+            fields = _packageinfo_record.unpack_from(buf, offset)
+            header = dict(zip(('packageid', 'sha1', 'change_number'), fields))
+            offset += _packageinfo_record.size
+
+            if self.version >= 40:
+                header['access_token'], = _packageinfo_token.unpack_from(buf, offset)
+                offset += _packageinfo_token.size
+
+        return header, offset
+
+    def _decode(self, offset):
+        offset = self._record(offset)[1]
+
+        if self.select is not None:
+            return vdf._binary_select(self._buf, offset, self.select, self.mapper, self.merge_duplicate_keys, False,
+                                      self.intern, self.key_table, find_end=False, stop_early=self.stop_early)[0]
+
+        return vdf._binary_decode(self._buf, offset, self.mapper, self.merge_duplicate_keys, False, self.intern,
+                                  self.key_table)[0]
+
+    def _read_key_table(self, offset):
+        buf = self._buf
+
+        if not 0 <= offset <= len(buf) - _uint32.size:
+            raise SyntaxError("Invalid key table offset: %d" % offset)
+
+        count, = _uint32.unpack_from(buf, offset)
+        offset += _uint32.size
+        keys = []
+
+        for _ in range(count):
+            end = buf.find(b'\x00', offset)
+
+            if end == -1:
+                raise SyntaxError("Unterminated cstring (offset: %d)" % offset)
+
+            keys.append(vdf._binary_string(buf[offset:end]))
+            offset = end + 1
+
+        return keys
+
+    def _scan(self):
+        # the ids and offsets of the records, from their headers
+        buf = self._buf
+        n = len(buf)
+        ids = []
+        offsets = {}
+        offset = self._start
+        end = 0 if self.id_field == 'appid' else 0xFFFFFFFF
+
+        while True:
+            if offset + _uint32.size > n:
+                raise SyntaxError("Reached EOF before the end of the records (offset: %d)" % offset)
+
+            id, = _uint32.unpack_from(buf, offset)
+
+            if id == end:
+                break
+
+            if id not in offsets:
+                ids.append(id)
+            offsets[id] = offset
+
+            if self.id_field == 'appid':
+                # the size covers the rest of the record
+                offset += 8 + _uint32.unpack_from(buf, offset + 4)[0]
+            else:
+                # packageinfo records have no size, the data is skipped over
+                offset = vdf._binary_skip(buf, self._record(offset)[1], False)
+
+        return ids, offsets
+
+    def _stamp(self):
+        st = os.stat(self.path)
+        return st.st_size, getattr(st, 'st_mtime_ns', None) or int(st.st_mtime * 1e9)
+
+    def _load_index(self):
+        if self.index_path is None:
+            return self._scan()
+
+        stamp = self._stamp()
+
+        try:
+            with open(self.index_path, 'rb') as fp:
+                data = fp.read()
+
+            magic, size, mtime, count = _index_header.unpack_from(data, 0)
+
+            if magic == _INDEX_MAGIC and (size, mtime) == stamp:
+                ids = []
+                offsets = {}
+
+                for i in range(count):
+                    id, offset = _index_entry.unpack_from(data, _index_header.size + i * _index_entry.size)
+                    ids.append(id)
+                    offsets[id] = offset
+
+                return ids, offsets
+        except (EnvironmentError, struct.error):
+            pass
+
+        ids, offsets = self._scan()
+        data = [_index_header.pack(_INDEX_MAGIC, stamp[0], stamp[1], len(ids))]
+        data.extend(_index_entry.pack(id, offsets[id]) for id in ids)
+
+        try:
+            with open(self.index_path, 'wb') as fp:
+                fp.write(b''.join(data))
+        except EnvironmentError:
+            # the index is only a cache
+            pass
+
+        return ids, offsets
@@ -0,0 +1,205 @@
+"""
+Extracting fields of repeated records, e.g. the items in ``items_game.txt``, into columns
+"""
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import vdf
+
+# NumPy style type codes -> array typecodes
+_TYPECODES = {
+    'i1': 'b', 'u1': 'B',
+    'i2': 'h', 'u2': 'H',
+    'i4': 'i', 'u4': 'I',
+    'i8': 'q', 'u8': 'Q',
+    'f4': 'f', 'f8': 'd',
+}
+
+# kind -> (converter, missing value)
+_KINDS = {
+    'i': (int, 0),
+    'u': (int, 0),
+    'f': (float, float('nan')),
+    'b': (lambda value: bool(int(value)), False),
+    'U': (lambda value: value, ''),
+    'S': (lambda value: value, b''),
+    'O': (lambda value: value, None),
+}
+
+_MISSING = object()
+
+
+def extract_columns(source, records, fields, binary=False, use_numpy=None, **kwargs):
+    """
+    Extract ``fields`` of every record at the path ``records`` into columns
+
+    .. code:: python
+
+        items = vdf.extract_columns(open('items_game.txt'), ['items_game', 'items', '*'],
+                                    [('defindex', [], int), ('name', 'name', str), ('used_by', ['used_by_classes', 'scout'], int)])
+
+    ``source`` is a parsed tree, or a file-like object it's loaded from with ``load``, or with ``binary_load``
+    when ``binary`` is set (``bytes`` are then accepted too). Files are loaded with ``select``, so that only
+    the fields are decoded. The other keyword arguments are passed on to the loader.
+
+    ``records`` is a path as for ``select``, where ``*`` matches any key.
+
+    ``fields`` is a list of ``(name, path, dtype)``. ``path`` is a key or list of keys under the record,
+    an empty list being the key of the record itself. ``dtype`` is ``int``, ``float``, ``str`` or a NumPy style
+    type code (e.g. ``'i4'``, ``'f8'``, and any other NumPy dtype when NumPy is used). Text values are converted
+    to numbers, string columns keep values as they are.
+
+    Rows are the records that have at least one of the fields, besides their key. Missing fields,
+    and fields that are blocks, are ``0``, ``nan``, ``''`` (``None`` without NumPy) or ``False``.
+
+    Returns a NumPy structured array, when NumPy is installed and ``use_numpy`` isn't ``False``.
+    Otherwise an ``OrderedDict`` of the columns, as ``array.array`` for numbers and ``list`` for the rest.
+    """
+    if use_numpy and numpy is None:
+        raise ValueError("use_numpy is set, but NumPy is not installed")
+
+    np = numpy if use_numpy is not False else None
+    records = vdf._normalize_paths(records)
+
+    if len(records) != 1:
+        raise TypeError("Expected records to be a single path")
+
+    records = records[0]
+    fields = [_column_field(field, np) for field in fields] if isinstance(fields, (list, tuple)) else None
+
+    if not fields:
+        raise TypeError("Expected fields to be a non-empty list of (name, path, dtype)")
+
+    if not isinstance(source, vdf.Mapping):
+        source = _load(source, records, fields, binary, kwargs)
+
+    columns = _fill(source, records, fields, np)
+
+    if np is None:
+        return OrderedDict((field[0], column) for field, column in zip(fields, columns))
+
+    result = np.empty(len(columns[0]), dtype=[(field[0], field[2]) for field in fields])
+
+    for field, column in zip(fields, columns):
+        result[field[0]] = column
+
+    return result
+
+def _column_field(field, np):
+    if not isinstance(field, tuple) or len(field) != 3:
+        raise TypeError("Expected field to be (name, path, dtype), got %s" % repr(field))
+
+    name, path, dtype = field
+
+    if isinstance(path, vdf.string_type):
+        path = (path,)
+    if not isinstance(path, (list, tuple)) or not all(isinstance(key, vdf.string_type) for key in path):
+        raise TypeError("Expected field path to be a key or a list of keys, got %s" % repr(path))
+
+    if dtype is int:
+        dtype = 'i8'
+    elif dtype is float:
+        dtype = 'f8'
+    elif dtype is str or dtype is vdf.string_type or dtype is object:
+        dtype = object
+
+    if np is not None:
+        dtype = np.dtype(dtype)
+        kind = dtype.kind
+    elif dtype is object:
+        kind = 'O'
+    elif dtype in _TYPECODES:
+        kind = dtype[0]
+    else:
+        raise ValueError("Unsupported dtype without NumPy: %s" % repr(field[2]))
+
+    if kind not in _KINDS:
+        raise ValueError("Unsupported dtype: %s" % repr(field[2]))
+
+    convert, missing = _KINDS[kind]
+    return name, tuple(path), dtype, convert, missing
+
+def _load(source, records, fields, binary, kwargs):
+    paths = [records + path for _, path, _, _, _ in fields if path]
+    select = paths or [records]
+
+    if binary:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return vdf.binary_loads(source, select=select, **kwargs)
+        return vdf.binary_load(source, select=select, **kwargs)
+
+    return vdf.load(source, select=select, **kwargs)
+
+def _iter_records(node, path, key=None):
+    if not path:
+        yield key, node
+        return
+
+    head, rest = path[0], path[1:]
+
+    if head == '*' or isinstance(node, vdf.VDFDict):
+        # VDFDict may have duplicates of head
+        items = node.items()
+    else:
+        items = [(head, node[head])] if head in node else ()
+
+    for key, value in items:
+        if (head == '*' or key == head) and isinstance(value, vdf.Mapping):
+            for record in _iter_records(value, rest, key):
+                yield record
+
+def _fill(tree, records, fields, np):
+    columns = []
+
+    for _, _, dtype, _, _ in fields:
+        if np is not None or dtype is object:
+            columns.append([])
+        else:
+            try:
+                columns.append(array(_TYPECODES[dtype]))
+            except ValueError:
+                # no 64-bit typecodes on Python 2
+                columns.append([])
+
+    appends = [column.append for column in columns]
+    keys_only = all(not path for _, path, _, _, _ in fields)
+    Mapping = vdf.Mapping
+
+    for key, record in _iter_records(tree, records):
+        row = []
+        found = keys_only
+
+        for name, path, _, convert, missing in fields:
+            if path:
+                value = record
+
+                for step in path:
+                    if not isinstance(value, Mapping) or step not in value:
+                        value = _MISSING
+                        break
+                    value = value[step]
+
+                if value is _MISSING or isinstance(value, Mapping):
+                    row.append(missing)
+                    continue
+            else:
+                value = key
+
+            try:
+                row.append(convert(value))
+            except (TypeError, ValueError) as exp:
+                raise ValueError("Field %s of record %s: %s" % (repr(name), repr(key), exp))
+
+            if path:
+                found = True
+
+        if found:
+            for append, value in zip(appends, row):
+                append(value)
+
+    return columns
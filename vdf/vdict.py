@@ -1,9 +1,9 @@
 import sys
-from collections import Counter
 
 if sys.version_info[0] >= 3:
     _iter_values = 'values'
     _range = range
+    _zip = zip
     _string_type = str
     import collections.abc as _c
     class _kView(_c.KeysView):
@@ -18,13 +18,28 @@ if sys.version_info[0] >= 3:
 else:
     _iter_values = 'itervalues'
     _range = xrange
+    from itertools import izip as _zip
     _string_type = basestring
     _kView = lambda x: list(x.iterkeys())
     _vView = lambda x: list(x.itervalues())
     _iView = lambda x: list(x.iteritems())
 
 
+# marks the slots of deleted items
+_DELETED = object()
+
+# the index is read through these, super() is too slow for lookups
+_dict_len = dict.__len__
+_dict_contains = dict.__contains__
+_dict_get = dict.get
+_dict_setitem = dict.__setitem__
+_dict_update = dict.update
+_dict_clear = dict.clear
+
+
 class VDFDict(dict):
+    __slots__ = ('__keys', '__values', '__deleted', '__weakref__')
+
     def __init__(self, data=None):
         """
         This is a dictionary that supports duplicate keys and preserves insert order
@@ -37,8 +52,12 @@ class VDFDict(dict):
 
         When the ``key`` is ``str``, instead of tuple, set will create a duplicate and get will look up ``(0, key)``
         """
-        self.__omap = []
-        self.__kcount = Counter()
+        # items are kept in slots, in insert order, and the dict itself maps each key to its slot,
+        # or to a list of slots when it has duplicates. Deleting leaves an empty slot behind,
+        # so the other slots don't move, and the slots are compacted once half of them are empty.
+        self.__keys = []
+        self.__values = []
+        self.__deleted = 0
 
         if data is not None:
             if not isinstance(data, (list, dict)):
@@ -47,11 +66,15 @@ class VDFDict(dict):
 
     def __repr__(self):
         out = "%s(" % self.__class__.__name__
-        out += "%s)" % repr(list(self.iteritems()))
+        out += "%s)" % repr(list(self._iteritems()))
         return out
 
+    def __reduce__(self):
+        # rebuild from the items, the key bookkeeping has to exist before the first key is set
+        return self.__class__, (list(self._iteritems()),)
+
     def __len__(self):
-        return len(self.__omap)
+        return len(self.__keys) - self.__deleted
 
     def _verify_key_tuple(self, key):
         if len(key) != 2:
@@ -70,61 +93,112 @@ class VDFDict(dict):
             raise TypeError("Expected key to be a str or tuple, got %s" % type(key))
         return key
 
+    def _slots(self, key):
+        # returns the slots of a key as a sequence
+        slots = _dict_get(self, key)
+
+        if slots is None:
+            return ()
+        return slots if slots.__class__ is list else (slots,)
+
+    def _slot(self, key):
+        # returns the slot of a normalized key
+        slots = _dict_get(self, key[1])
+
+        if slots.__class__ is list:
+            if 0 <= key[0] < len(slots):
+                return slots[key[0]]
+        elif slots is not None and key[0] == 0:
+            return slots
+
+        raise KeyError(key)
+
     def __setitem__(self, key, value):
         if isinstance(key, _string_type):
-            key = (self.__kcount[key], key)
-            self.__omap.append(key)
+            slots = _dict_get(self, key)
+
+            if slots is None:
+                super(VDFDict, self).__setitem__(key, len(self.__keys))
+            elif slots.__class__ is list:
+                slots.append(len(self.__keys))
+            else:
+                super(VDFDict, self).__setitem__(key, [slots, len(self.__keys)])
+
+            self.__keys.append(key)
+            self.__values.append(value)
         elif isinstance(key, tuple):
             self._verify_key_tuple(key)
             if key not in self:
                 raise KeyError("%s doesn't exist" % repr(key))
+            self.__values[self._slot(key)] = value
         else:
             raise TypeError("Expected either a str or tuple for key")
-        super(VDFDict, self).__setitem__(key, value)
-        self.__kcount[key[1]] += 1
 
     def __getitem__(self, key):
-        return super(VDFDict, self).__getitem__(self._normalize_key(key))
+        if isinstance(key, _string_type):
+            slots = _dict_get(self, key)
+            if slots is not None:
+                return self.__values[slots if slots.__class__ is not list else slots[0]]
+        return self.__values[self._slot(self._normalize_key(key))]
 
     def __delitem__(self, key):
         key = self._normalize_key(key)
-        result = super(VDFDict, self).__delitem__(key)
-
-        start_idx = self.__omap.index(key)
-        del self.__omap[start_idx]
-
-        dup_idx, skey = key
-        self.__kcount[skey] -= 1
-        tail_count = self.__kcount[skey] - dup_idx
+        slot = self._slot(key)
+        slots = super(VDFDict, self).__getitem__(key[1])
 
-        if tail_count > 0:
-            for idx in _range(start_idx, len(self.__omap)):
-                if self.__omap[idx][1] == skey:
-                    oldkey = self.__omap[idx]
-                    newkey = (dup_idx, skey)
-                    super(VDFDict, self).__setitem__(newkey, self[oldkey])
-                    super(VDFDict, self).__delitem__(oldkey)
-                    self.__omap[idx] = newkey
-
-                    dup_idx += 1
-                    tail_count -= 1
-                    if tail_count == 0:
-                        break
-
-        if self.__kcount[skey] == 0:
-            del self.__kcount[skey]
-
-        return result
+        if slots.__class__ is list:
+            del slots[key[0]]
+            if len(slots) == 1:
+                super(VDFDict, self).__setitem__(key[1], slots[0])
+        else:
+            super(VDFDict, self).__delitem__(key[1])
+
+        self._clear_slot(slot)
+        self._trim()
+
+    def _clear_slot(self, slot):
+        self.__keys[slot] = _DELETED
+        self.__values[slot] = None
+        self.__deleted += 1
+
+    def _trim(self):
+        keys, values = self.__keys, self.__values
+
+        # the last slot is always in use, so popitem() doesn't have to search for it
+        while keys and keys[-1] is _DELETED:
+            keys.pop()
+            values.pop()
+            self.__deleted -= 1
+
+        if self.__deleted > len(keys) // 2:
+            self._compact()
+
+    def _compact(self):
+        # rebuilt without going through __setitem__, which a subclass may have changed
+        keys, values = self.__keys, self.__values
+        live = [slot for slot, key in enumerate(keys) if key is not _DELETED]
+        _dict_clear(self)
+        self.__keys = [keys[slot] for slot in live]
+        self.__values = [values[slot] for slot in live]
+        self.__deleted = 0
+        self._index(0)
 
     def __iter__(self):
         return iter(self.iterkeys())
 
     def __contains__(self, key):
-        return super(VDFDict, self).__contains__(self._normalize_key(key))
+        if isinstance(key, _string_type):
+            return _dict_contains(self, key)
+        idx, key = self._normalize_key(key)
+        return 0 <= idx < len(self._slots(key))
 
     def __eq__(self, other):
         if isinstance(other, VDFDict):
-            return list(self.items()) == list(other.items())
+            if len(self) != len(other):
+                return False
+            if not self.__deleted and not other.__deleted:
+                return self.__keys == other.__keys and self.__values == other.__values
+            return list(self.iteritems()) == list(other.iteritems())
         else:
             return False
 
@@ -133,11 +207,18 @@ class VDFDict(dict):
 
     def clear(self):
         super(VDFDict, self).clear()
-        self.__kcount.clear()
-        self.__omap = list()
+        self.__keys = []
+        self.__values = []
+        self.__deleted = 0
 
     def get(self, key, *args):
-        return super(VDFDict, self).get(self._normalize_key(key), *args)
+        if isinstance(key, _string_type):
+            slots = _dict_get(self, key)
+            if slots is not None:
+                return self.__values[slots if slots.__class__ is not list else slots[0]]
+        elif key in self:
+            return self.__getitem__(key)
+        return args[0] if args else None
 
     def setdefault(self, key, default=None):
         if key not in self:
@@ -145,69 +226,142 @@ class VDFDict(dict):
         return self.__getitem__(key)
 
     def pop(self, key):
-        key = self._normalize_key(key)
         value = self.__getitem__(key)
         self.__delitem__(key)
         return value
 
     def popitem(self):
-        if not self.__omap:
+        if not self.__keys:
             raise KeyError("VDFDict is empty")
-        key = self.__omap[-1]
-        return key[1], self.pop(key)
+        key = self.__keys[-1]
+        value = self.__values[-1]
+        self.__delitem__((len(self._slots(key)) - 1, key))
+        return key, value
 
     def update(self, data=None, **kwargs):
         if isinstance(data, dict):
             data = data.items()
-        elif not isinstance(data, list):
-            raise TypeError("Expected data to be a list or dict, got %s" % type(data))
+        elif isinstance(data, (_string_type, bytes)) or not hasattr(data, '__iter__'):
+            raise TypeError("Expected data to be an iterable of pairs or dict, got %s" % type(data))
 
         for key, value in data:
             self.__setitem__(key, value)
 
+    @classmethod
+    def from_pairs(cls, pairs):
+        """
+        Returns a new ``VDFDict`` of the ``(key, value)`` pairs in the iterable ``pairs``
+
+        The same as ``VDFDict(pairs)``, but the keys are indexed in one go at the end.
+        """
+        self = cls()
+
+        if cls.__setitem__ != VDFDict.__setitem__:
+            self.update(pairs)
+            return self
+
+        append_key, append_value, start = self._builder()
+
+        for key, value in pairs:
+            if isinstance(key, _string_type):
+                append_key(key)
+                append_value(value)
+            else:
+                # (index, key) sets a duplicate that is already there, or raises as in update()
+                start = self._index(start)
+                self.__setitem__(key, value)
+
+        self._index(start)
+        return self
+
+    def _builder(self):
+        # for adding items in bulk, e.g. by the parsers: returns (append_key, append_value, start).
+        # The keys are not checked, and _index(start) has to be called before the dict is used otherwise.
+        return self.__keys.append, self.__values.append, len(self.__keys)
+
+    def _index(self, start):
+        # adds the slots of the keys appended since start, returns where the next call should start
+        keys = self.__keys
+        end = len(keys)
+
+        if not start and not _dict_len(self):
+            # without duplicates, the index is built in one go
+            _dict_update(self, _zip(keys, _range(end)))
+
+            if _dict_len(self) == end:
+                return end
+
+            _dict_clear(self)
+
+        for slot in _range(start, end):
+            key = keys[slot]
+            slots = _dict_get(self, key)
+
+            if slots is None:
+                _dict_setitem(self, key, slot)
+            elif slots.__class__ is list:
+                slots.append(slot)
+            else:
+                _dict_setitem(self, key, [slots, slot])
+
+        return end
+
     def iterkeys(self):
-        return (key[1] for key in self.__omap)
+        return (key for key in self.__keys if key is not _DELETED)
 
     def keys(self):
         return _kView(self)
 
     def itervalues(self):
-        return (self[key] for key in self.__omap)
+        return (value for key, value in _zip(self.__keys, self.__values) if key is not _DELETED)
 
     def values(self):
         return _vView(self)
 
     def iteritems(self):
-        return ((key[1], self[key]) for key in self.__omap)
+        return ((key, value) for key, value in _zip(self.__keys, self.__values) if key is not _DELETED)
 
     def items(self):
         return _iView(self)
 
+    def _iteritems(self):
+        # iteritems() for callers that don't change the dict meanwhile,
+        # without empty slots the lists are iterated directly
+        if not self.__deleted:
+            return _zip(self.__keys, self.__values)
+        return self.iteritems()
+
     def get_all_for(self, key):
         """ Returns all values of the given key """
         if not isinstance(key, _string_type):
             raise TypeError("Key needs to be a string.")
-        return [self[(idx, key)] for idx in _range(self.__kcount[key])]
+        values = self.__values
+        return [values[slot] for slot in self._slots(key)]
 
     def remove_all_for(self, key):
         """ Removes all items with the given key """
         if not isinstance(key, _string_type):
             raise TypeError("Key need to be a string.")
 
-        for idx in _range(self.__kcount[key]):
-            super(VDFDict, self).__delitem__((idx, key))
+        slots = self._slots(key)
+        keys, values = self.__keys, self.__values
+
+        for slot in slots:
+            keys[slot] = _DELETED
+            values[slot] = None
 
-        self.__omap = list(filter(lambda x: x[1] != key, self.__omap))
+        self.__deleted += len(slots)
+        super(VDFDict, self).pop(key, None)
 
-        del self.__kcount[key]
+        self._trim()
 
     def has_duplicates(self):
         """
         Returns ``True`` if the dict contains keys with duplicates.
         Recurses through any all keys with value that is ``VDFDict``.
         """
-        for n in getattr(self.__kcount, _iter_values)():
-            if n != 1:
+        for slots in getattr(super(VDFDict, self), _iter_values)():
+            if slots.__class__ is list:
                 return True
 
         def dict_recurse(obj):
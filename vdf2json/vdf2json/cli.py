@@ -26,17 +26,15 @@ def main():
     # unicode pain
     if args.infile is not sys.stdin:
         args.infile.close()
-        args.infile = codecs.open(args.infile.name, 'r', encoding=args.ei)
+        data = vdf.load_path(args.infile.name, encoding=args.ei, mapper=OrderedDict)
     else:
-        args.infile = codecs.getreader(args.ei)(sys.stdin)
+        data = vdf.load(codecs.getreader(args.ei)(getattr(sys.stdin, 'buffer', sys.stdin)), mapper=OrderedDict)
 
     if args.outfile is not sys.stdout:
         args.outfile.close()
         args.outfile = codecs.open(args.outfile.name, 'w', encoding=args.eo)
     else:
-        args.outfile = codecs.getwriter(args.eo)(sys.stdout)
-
-    data = vdf.loads(args.infile.read(), mapper=OrderedDict)
+        args.outfile = codecs.getwriter(args.eo)(getattr(sys.stdout, 'buffer', sys.stdout))
 
     json.dump(data, args.outfile, indent=4 if args.pretty else 0, ensure_ascii=False)
 